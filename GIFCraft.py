@@ -1,15 +1,1334 @@
 import tkinter as tk
 from tkinter import filedialog, messagebox, simpledialog, ttk, colorchooser
 from tkinter import Menu, Checkbutton, IntVar, Scrollbar, Frame, Canvas
-from PIL import Image, ImageTk, ImageDraw, ImageFont, ImageSequence, ImageEnhance, ImageFilter, ImageColor, ImageOps
+from PIL import Image, ImageTk, ImageDraw, ImageFont, ImageEnhance, ImageFilter, ImageColor, ImageOps
 import os
 import math
+import pickle
+import zlib
 import random
 import platform
+import shutil
+import tempfile
+import weakref
 import numpy as np
 import threading
+import multiprocessing
+from multiprocessing import shared_memory
 import time
 import cv2
+import itertools
+import functools
+import queue
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+# FRAME STORAGE
+
+def fit_to_size(image, size):
+    """Resize the image to the given size and center it on a transparent RGBA canvas."""
+    if size is None:
+        return image
+    base_width, base_height = size
+    new_image = Image.new("RGBA", size, (0, 0, 0, 0))
+    image = image.resize(size, Image.Resampling.LANCZOS)
+    new_image.paste(image, ((base_width - image.width) // 2, (base_height - image.height) // 2))
+    return new_image
+
+def scan_gif_durations(fp):
+    """
+    Walk the block structure of a GIF file without decoding any pixel data.
+
+    Returns:
+        list: The duration in milliseconds of every frame, in file order.
+    """
+    header = fp.read(13)
+    if len(header) < 13 or header[:3] != b"GIF":
+        raise ValueError("Not a GIF file.")
+    if header[10] & 0x80:
+        fp.seek(3 << ((header[10] & 0x07) + 1), os.SEEK_CUR)  # Skip the global color table
+
+    def skip_sub_blocks():
+        while True:
+            size = fp.read(1)
+            if not size or size[0] == 0:
+                return
+            fp.seek(size[0], os.SEEK_CUR)
+
+    durations = []
+    duration = None
+    while True:
+        block = fp.read(1)
+        if not block or block == b";":
+            break
+        if block == b"!":
+            label = fp.read(1)
+            if label == b"\xf9":
+                data = fp.read(fp.read(1)[0])
+                duration = int.from_bytes(data[1:3], "little") * 10
+            skip_sub_blocks()
+        elif block == b",":
+            descriptor = fp.read(9)
+            if descriptor[8] & 0x80:
+                fp.seek(3 << ((descriptor[8] & 0x07) + 1), os.SEEK_CUR)  # Skip the local color table
+            fp.read(1)  # LZW minimum code size
+            skip_sub_blocks()
+            durations.append(100 if duration is None else duration)
+            duration = None
+        else:
+            break  # Unknown block, the rest of the file is unreadable
+    return durations
+
+def scan_webp_durations(fp):
+    """
+    Walk the RIFF chunks of an animated WebP file without decoding any pixel data.
+
+    Returns:
+        list: The duration in milliseconds of every frame, in file order.
+    """
+    header = fp.read(12)
+    if len(header) < 12 or header[:4] != b"RIFF" or header[8:12] != b"WEBP":
+        raise ValueError("Not a WebP file.")
+
+    durations = []
+    while True:
+        chunk = fp.read(8)
+        if len(chunk) < 8:
+            break
+        size = int.from_bytes(chunk[4:8], "little")
+        if chunk[:4] == b"ANMF":
+            payload = fp.read(16)
+            durations.append(int.from_bytes(payload[12:15], "little"))
+            size -= len(payload)
+        fp.seek(size + (size & 1), os.SEEK_CUR)  # Chunks are padded to an even size
+    return durations
+
+class FrameRef:
+    """Base class for frame list entries that produce their image only when it is accessed."""
+
+    def load(self):
+        """Return the frame image."""
+        raise NotImplementedError
+
+class LazyFrame(FrameRef):
+    """Placeholder for a frame that is decoded from its source file only when it is accessed."""
+
+    def __init__(self, source, index):
+        self.source = source
+        self.index = index
+
+    def load(self):
+        """Return the decoded frame."""
+        return self.source.get_frame(self.index)
+
+class LazyFrameSource:
+    """
+    Index the frames and delays of an animated image up front and decode frames on demand.
+
+    The file stays open until close() or until the source is garbage collected with its last frame.
+    """
+
+    open_sources = weakref.WeakSet()  # Sources that still hold their file open
+
+    def __init__(self, file_path, size=None, cache_size=32, checkpoint_budget=256 * 1024 * 1024):
+        self.file_path = file_path
+        self.size = size  # Decoded frames are fitted to this size, like resize_to_base_size does
+        self.cache_size = cache_size
+        self.checkpoint_budget = checkpoint_budget
+        self._cache = OrderedDict()
+        self._checkpoints = OrderedDict()  # index -> (mode, size, palette, transparency, compressed pixels)
+        self._checkpoint_bytes = 0
+        self._lock = threading.Lock()
+        self._image = Image.open(file_path)
+        self._finalizer = weakref.finalize(self, self._image.close)
+        LazyFrameSource.open_sources.add(self)
+
+        if self._image.format in ("GIF", "WEBP"):
+            scan_durations = scan_gif_durations if self._image.format == "GIF" else scan_webp_durations
+            with open(file_path, "rb") as fp:
+                self.delays = scan_durations(fp)
+        else:
+            self.delays = []
+            for index in range(getattr(self._image, "n_frames", 1)):
+                self._image.seek(index)
+                self.delays.append(int(self._image.info.get('duration', 100)))
+            self._image.seek(0)
+
+    def __len__(self):
+        return len(self.delays)
+
+    def frames(self):
+        """Return a placeholder for every frame of the file."""
+        return [LazyFrame(self, index) for index in range(len(self))]
+
+    def get_frame(self, index):
+        """
+        Decode a single frame, serving recently used frames from the LRU cache.
+
+        GIF and WebP frames can only be decoded forward, and seeking backwards decodes again from the
+        first frame. Every frame passed on the way is therefore kept zlib-compressed as a checkpoint, so
+        frames can be read in any order, by any thread, after they were decoded once.
+        """
+        with self._lock:
+            frame = self._cache.get(index)
+            if frame is not None:
+                self._cache.move_to_end(index)
+                return frame
+
+            frame = self._restore_checkpoint(index)
+            if frame is None:
+                frame = self._decode(index)
+
+            self._cache[index] = frame
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+            return frame
+
+    def close(self):
+        """
+        Release the file, e.g. before it is overwritten.
+
+        Every frame is kept as a checkpoint first, without a budget, so the frames of the source can still
+        be read afterwards.
+        """
+        with self._lock:
+            if self._image is None:
+                return
+            self.checkpoint_budget = None
+            for index in range(len(self)):
+                if index not in self._checkpoints:
+                    self._decode(index)
+            self._finalizer()
+            self._image = None
+            LazyFrameSource.open_sources.discard(self)
+
+    def _decode(self, index):
+        position = self._image.tell()
+        for i in range(position if position <= index else 0, index + 1):
+            self._image.seek(i)
+            if i != index and i in self._checkpoints:
+                continue
+            frame = fit_to_size(self._image.copy(), self.size)
+            self._add_checkpoint(i, frame)
+        return frame
+
+    def _add_checkpoint(self, index, frame):
+        palette = frame.getpalette() if frame.palette else None
+        data = zlib.compress(frame.tobytes(), 1)
+        self._checkpoints[index] = (frame.mode, frame.size, palette, frame.info.get('transparency'), data)
+        self._checkpoint_bytes += len(data)
+        while self.checkpoint_budget is not None and self._checkpoint_bytes > self.checkpoint_budget and len(self._checkpoints) > 1:
+            self._checkpoint_bytes -= len(self._checkpoints.popitem(last=False)[1][4])
+
+    def _restore_checkpoint(self, index):
+        checkpoint = self._checkpoints.get(index)
+        if checkpoint is None:
+            return None
+        self._checkpoints.move_to_end(index)
+        mode, size, palette, transparency, data = checkpoint
+        frame = Image.frombytes(mode, size, zlib.decompress(data))
+        if palette is not None:
+            frame.putpalette(palette)
+        if transparency is not None:
+            frame.info['transparency'] = transparency
+        return frame
+
+class FrameList(list):
+    """List of frames that transparently resolves FrameRef entries when frames are read."""
+
+    def __getitem__(self, index):
+        item = super().__getitem__(index)
+        if isinstance(index, slice):
+            return FrameList(item)
+        return item.load() if isinstance(item, FrameRef) else item
+
+    def __iter__(self):
+        for item in super().__iter__():
+            yield item.load() if isinstance(item, FrameRef) else item
+
+    def raw(self, index):
+        """Return the stored entry at index without decoding it."""
+        return super().__getitem__(index)
+
+    def copy(self):
+        """Return a shallow copy that keeps placeholders undecoded."""
+        return FrameList(super().__iter__())
+
+def save_animation(frames, file_path, **params):
+    """
+    Save frames as an animation through a temporary file that then replaces file_path.
+
+    Lazy frames may still be decoded from the file being overwritten while the new one is written; their
+    source is closed only right before the replace, and a failed save leaves the old file untouched.
+    """
+    directory, name = os.path.split(os.path.abspath(file_path))
+    fd, temp_path = tempfile.mkstemp(prefix=f".{name}.", dir=directory)
+    os.close(fd)
+    try:
+        if os.path.exists(file_path):
+            shutil.copymode(file_path, temp_path)
+        else:
+            umask = os.umask(0)
+            os.umask(umask)
+            os.chmod(temp_path, 0o666 & ~umask)  # mkstemp creates the file readable by the owner only
+        params.setdefault('format', Image.registered_extensions().get(os.path.splitext(name)[1].lower()))
+        frames[0].save(temp_path, save_all=True, append_images=frames[1:], **params)
+        if os.path.exists(file_path):
+            for source in list(LazyFrameSource.open_sources):
+                if os.path.exists(source.file_path) and os.path.samefile(source.file_path, file_path):
+                    source.close()  # An open file cannot be replaced on Windows
+        os.replace(temp_path, file_path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+class FrameArena:
+    """
+    Store same-size RGBA frames in one contiguous (N, H, W, 4) uint8 array.
+
+    Images handed out by image() are zero-copy views into the array, so a slot must not be
+    written to once its image has been stored in the frame list.
+    """
+
+    def __init__(self, size, capacity=16):
+        self.size = size
+        self.count = 0
+        self._data = self._allocate(max(1, capacity))
+
+    def _allocate(self, capacity):
+        width, height = self.size
+        return np.empty((capacity, height, width, 4), dtype=np.uint8)
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def capacity(self):
+        return len(self._data)
+
+    @property
+    def array(self):
+        """The (N, H, W, 4) array holding the stored frames."""
+        return self._data[:self.count]
+
+    def append(self, image):
+        """Copy an image into the next free slot and return the slot index."""
+        if image.size != self.size:
+            raise ValueError(f"Frame size {image.size} does not match the arena size {self.size}.")
+        if self.count == self.capacity:
+            self._grow(self.count + 1)
+        self._data[self.count] = np.asarray(image.convert("RGBA"))
+        self.count += 1
+        return self.count - 1
+
+    def _grow(self, minimum):
+        """Reallocate with at least twice the capacity so that appends stay amortized O(1)."""
+        data = self._allocate(max(minimum, self.capacity * 2))
+        data[:self.count] = self._data[:self.count]
+        self._data = data
+
+    def image(self, index):
+        """Return a read-only RGBA image sharing the memory of a stored frame."""
+        return Image.frombuffer("RGBA", self.size, self._data[index], "raw", "RGBA", 0, 1)
+
+    def batches(self, count):
+        """Split the stored frames into at most count consecutive (n, H, W, 4) views of about equal length."""
+        step = max(1, -(-self.count // count))
+        return [self._data[start:min(start + step, self.count)] for start in range(0, self.count, step)]
+
+class SharedFrameArena(FrameArena):
+    """
+    FrameArena of fixed capacity in a multiprocessing.shared_memory block.
+
+    Worker processes attach to it by name and see the frames as NumPy views, so frames cross process
+    boundaries without being pickled and workers write their results in place. image() copies a frame
+    out, so that close() can release the block as soon as the work is done.
+    """
+
+    def __init__(self, size, capacity):
+        self._memory = None
+        super().__init__(size, capacity)
+
+    def _allocate(self, capacity):
+        if self._memory is not None:
+            raise ValueError("A shared frame arena cannot grow.")
+        width, height = self.size
+        self._memory = shared_memory.SharedMemory(create=True, size=capacity * height * width * 4)
+        return np.ndarray((capacity, height, width, 4), dtype=np.uint8, buffer=self._memory.buf)
+
+    @property
+    def handle(self):
+        """The (name, shape) pair that workers attach to the block with."""
+        return self._memory.name, self._data.shape
+
+    def image(self, index):
+        """Return an RGBA image holding a copy of a stored frame."""
+        return Image.frombuffer("RGBA", self.size, self._data[index].copy(), "raw", "RGBA", 0, 1)
+
+    def close(self):
+        """Release and remove the shared memory block."""
+        if self._data is not None:
+            self._data = None
+            self._memory.close()
+            self._memory.unlink()
+
+class MappedFrame(FrameRef):
+    """Frame whose pixels live in a slot of a MappedFrameStore."""
+
+    def __init__(self, store, slot):
+        self.store = store
+        self.slot = slot
+
+    def load(self):
+        """Return a read-only image backed by the memory-mapped slot."""
+        image = self.store.image(self.slot)
+        image.mapped_frame = self  # Keep the slot reserved for as long as the image is alive
+        return image
+
+class MappedFrameStore:
+    """
+    Keep raw RGBA frames of one size in memory-mapped scratch files.
+
+    Only the pages of recently used frames stay in RAM, the operating system writes the rest back
+    to the scratch files instead of swapping. Slots are recycled once their MappedFrame is gone.
+    """
+
+    def __init__(self, size, chunk_bytes=256 << 20):
+        self.size = size
+        width, height = size
+        self.frame_shape = (height, width, 4)
+        self.chunk_frames = max(1, chunk_bytes // (width * height * 4))
+        self.directory = tempfile.mkdtemp(prefix="gifcraft-")
+        self._chunks = []
+        self._free = []
+        self._next_slot = 0
+        self._lock = threading.Lock()
+        weakref.finalize(self, shutil.rmtree, self.directory, ignore_errors=True)
+
+    def _allocate_slot(self):
+        with self._lock:
+            if self._free:
+                return self._free.pop()
+            if self._next_slot == len(self._chunks) * self.chunk_frames:
+                # Grow by a whole scratch file at a time
+                path = os.path.join(self.directory, f"frames_{len(self._chunks)}.raw")
+                self._chunks.append(np.memmap(path, dtype=np.uint8, mode="w+", shape=(self.chunk_frames,) + self.frame_shape))
+            self._next_slot += 1
+            return self._next_slot - 1
+
+    def _release(self, slot):
+        with self._lock:
+            self._free.append(slot)
+
+    def _view(self, slot):
+        chunk, offset = divmod(slot, self.chunk_frames)
+        return self._chunks[chunk][offset]
+
+    def store(self, image):
+        """Copy an image into a free slot and return its MappedFrame."""
+        slot = self._allocate_slot()
+        self._view(slot)[...] = np.asarray(image.convert("RGBA"))
+        frame = MappedFrame(self, slot)
+        weakref.finalize(frame, self._release, slot)
+        return frame
+
+    def image(self, slot):
+        """Return a read-only RGBA image sharing the memory of a slot."""
+        return Image.frombuffer("RGBA", self.size, self._view(slot), "raw", "RGBA", 0, 1)
+
+# UNDO HISTORY
+
+def image_nbytes(image):
+    """Approximate the memory held by the pixel data of an image."""
+    return image.width * image.height * len(image.getbands())
+
+class DeltaSnapshot:
+    """
+    Undo snapshot stored as the difference to the snapshot above it in its stack.
+
+    Frames that are still present in the newer snapshot are stored as their position there, frames whose
+    pixels changed inside a region only keep that region of the old pixels, and any other frame is kept
+    whole. Frame references, and images that a newer stacked frame is rendered from, are kept by reference.
+    Pixel data is zlib-compressed and can be spilled to a file on disk.
+
+    A snapshot at the top of its stack has no newer snapshot; it is encoded against the live frames and
+    keeps that list as newer_frames until a snapshot is pushed above it.
+    """
+
+    def __init__(self, state, newer_frames, keep_newer=False):
+        frames, delays, checkbox_states, frame_index, current_file = state
+        self.state = (delays, checkbox_states, frame_index, current_file)
+        self.chunks = []  # Compressed pixel data, None once spilled to self.path
+        self.path = None
+        self.newer_frames = newer_frames if keep_newer else None
+        positions = {id(newer_frames.raw(j)): j for j in range(len(newer_frames))}
+        self.entries = []
+        for i in range(len(frames)):
+            entry = frames.raw(i)
+            newer = newer_frames.raw(i) if i < len(newer_frames) else None  # Never resolved, that would render it
+            if id(entry) in positions:
+                self.entries.append(('same', positions[id(entry)]))
+            elif isinstance(entry, FrameRef) or (isinstance(newer, StackedFrame) and newer.base is entry):
+                self.entries.append(('ref', entry))  # Cheap to keep, or already kept alive by the newer frame
+            else:
+                self.entries.append(self._encode(entry, newer, i))
+
+    def _encode(self, image, base, i):
+        """Encode a frame that is not shared with the newer snapshot, against the newer entry at its position."""
+        if isinstance(base, Image.Image) and image.palette is None:
+            if base.mode == image.mode and base.size == image.size and base.palette is None:
+                changed = np.asarray(image) != np.asarray(base)
+                if changed.ndim == 3:
+                    changed = changed.any(axis=2)
+                rows = np.flatnonzero(changed.any(axis=1))
+                if not len(rows):
+                    return ('same', i)
+                cols = np.flatnonzero(changed.any(axis=0))
+                box = (int(cols[0]), int(rows[0]), int(cols[-1]) + 1, int(rows[-1]) + 1)
+                return ('region', i, box, self._add_chunk(image.crop(box).tobytes()))
+        palette = image.getpalette() if image.palette else None
+        return ('full', image.mode, image.size, palette, image.info.get('transparency'), self._add_chunk(image.tobytes()))
+
+    def _add_chunk(self, data):
+        self.chunks.append(zlib.compress(data, 1))
+        return len(self.chunks) - 1
+
+    def nbytes(self):
+        """Return the bytes of compressed pixel data held in RAM."""
+        return sum(len(chunk) for chunk in self.chunks) if self.chunks is not None else 0
+
+    def spill(self, path):
+        """Move the compressed pixel data to a file."""
+        with open(path, "wb") as fp:
+            pickle.dump(self.chunks, fp, protocol=pickle.HIGHEST_PROTOCOL)
+        self.chunks = None
+        self.path = path
+
+    def decode(self, newer_frames=None):
+        """Rebuild the full snapshot from the frames of the newer snapshot and delete any spill file."""
+        if newer_frames is None:
+            newer_frames = self.newer_frames
+        chunks = self.chunks
+        if chunks is None:
+            with open(self.path, "rb") as fp:
+                chunks = pickle.load(fp)
+
+        frames = FrameList()
+        for entry in self.entries:
+            kind = entry[0]
+            if kind == 'same':
+                frames.append(newer_frames.raw(entry[1]))
+            elif kind == 'ref':
+                frames.append(entry[1])
+            elif kind == 'region':
+                _, i, box, chunk = entry
+                image = newer_frames[i].copy()
+                region = Image.frombytes(image.mode, (box[2] - box[0], box[3] - box[1]), zlib.decompress(chunks[chunk]))
+                image.paste(region, box[:2])
+                frames.append(image)
+            else:
+                _, mode, size, palette, transparency, chunk = entry
+                image = Image.frombytes(mode, size, zlib.decompress(chunks[chunk]))
+                if palette is not None:
+                    image.putpalette(palette)
+                if transparency is not None:
+                    image.info['transparency'] = transparency
+                frames.append(image)
+        self.discard()
+        return (frames,) + self.state
+
+    def discard(self):
+        """Delete the spill file, if any."""
+        if self.path is not None:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+            self.path = None
+
+class UndoHistory:
+    """
+    Undo and redo stacks of editor snapshots with a memory budget.
+
+    Snapshots are (frames, delays, checkbox states, frame index, current file) tuples. Only the top of
+    each stack is kept as a full snapshot, sharing frame objects with the live frame list; every entry
+    below it is a DeltaSnapshot relative to the entry above, so the history costs memory proportional
+    to the edits rather than to the project. When the deltas exceed the budget, the ones furthest from
+    the current state are spilled to files on disk and read back when they are reached again.
+    """
+
+    def __init__(self, budget_bytes=512 << 20):
+        self.budget_bytes = budget_bytes
+        self.undo_stack = []
+        self.redo_stack = []
+        self._directory = None
+        self._spill_count = 0
+
+    def can_undo(self):
+        return bool(self.undo_stack)
+
+    def can_redo(self):
+        return bool(self.redo_stack)
+
+    def push(self, state):
+        """Record the state before an action. Clears the redo stack."""
+        self._push(self.undo_stack, state)
+        for entry in self.redo_stack:
+            if isinstance(entry, DeltaSnapshot):
+                entry.discard()
+        self.redo_stack.clear()
+        self.enforce_budget(state[0])
+
+    def undo(self, current_state):
+        """Return the previous state, remembering current_state for redo."""
+        return self._move(self.undo_stack, self.redo_stack, current_state)
+
+    def redo(self, current_state):
+        """Return the next state, remembering current_state for undo."""
+        return self._move(self.redo_stack, self.undo_stack, current_state)
+
+    def _push(self, stack, state):
+        if stack and isinstance(stack[-1], DeltaSnapshot) and stack[-1].newer_frames is not None:
+            top = stack[-1]
+            if list(map(id, list.__iter__(top.newer_frames))) == list(map(id, list.__iter__(state[0]))):
+                top.newer_frames = None  # Encoded against exactly these frames, the pushed state takes over
+            else:
+                stack[-1] = top.decode()
+        if stack and not isinstance(stack[-1], DeltaSnapshot):
+            stack[-1] = DeltaSnapshot(stack[-1], state[0])
+        stack.append(state)
+
+    def _pop(self, stack):
+        state = stack.pop()
+        if isinstance(state, DeltaSnapshot):
+            state = state.decode()  # A top that was compacted against the frames live at that time
+        if stack:
+            stack[-1] = stack[-1].decode(state[0])  # The new top was stored relative to the popped snapshot
+        return state
+
+    def _move(self, source, target, current_state):
+        state = self._pop(source)
+        self._push(target, current_state)
+        self.enforce_budget(state[0])
+        return state
+
+    def memory_usage(self, live_frames):
+        """Return the bytes held by the history that are not shared with live_frames."""
+        seen = {id(entry) for entry in list.__iter__(live_frames)}
+        total = 0
+        for state in self.undo_stack + self.redo_stack:
+            if isinstance(state, DeltaSnapshot):
+                total += state.nbytes()
+                continue
+            for entry in list.__iter__(state[0]):
+                if isinstance(entry, FrameRef) or id(entry) in seen:
+                    continue
+                seen.add(id(entry))
+                total += image_nbytes(entry)
+        return total
+
+    def enforce_budget(self, live_frames):
+        """
+        Spill deltas, oldest first, until the history fits into the budget.
+
+        The full snapshots at the top of the stacks are first encoded as deltas against live_frames, so
+        the frames an action replaced count against the budget and can be spilled as well.
+        """
+        usage = self.memory_usage(live_frames)
+        if usage <= self.budget_bytes:
+            return
+        for stack in (self.undo_stack, self.redo_stack):
+            if stack and not isinstance(stack[-1], DeltaSnapshot):
+                stack[-1] = DeltaSnapshot(stack[-1], live_frames.copy(), keep_newer=True)
+        candidates = [entry for entry in self.undo_stack + self.redo_stack
+                      if isinstance(entry, DeltaSnapshot) and entry.chunks]
+        usage = self.memory_usage(live_frames)
+        for entry in candidates:
+            if usage <= self.budget_bytes:
+                return
+            usage -= entry.nbytes()
+            entry.spill(self._next_spill_path())
+
+    def _next_spill_path(self):
+        if self._directory is None:
+            self._directory = tempfile.mkdtemp(prefix="gifcraft-history-")
+            weakref.finalize(self, shutil.rmtree, self._directory, ignore_errors=True)
+        self._spill_count += 1
+        return os.path.join(self._directory, f"snapshot_{self._spill_count}.bin")
+
+def decode_image_file(file_path, size):
+    """Decode an image file for import, fitted to size. Animated files are only indexed."""
+    with Image.open(file_path) as img:
+        if getattr(img, "n_frames", 1) == 1:
+            return [fit_to_size(img.copy(), size)], [int(img.info.get('duration', 100))]  # Ensure delay is always an integer
+    source = LazyFrameSource(file_path, size=size)
+    return source.frames(), source.delays
+
+def decode_first_frame(file_path, size):
+    """Decode the first frame of an image file for import, fitted to size."""
+    with Image.open(file_path) as image:
+        return [fit_to_size(image.copy(), size)], [100]
+
+# FRAME CACHES
+
+class FrameImageCache:
+    """
+    LRU cache of images derived from frames, bounded by a byte budget.
+
+    Entries are keyed by the identity of the frame list entry plus any extra key parts. Frames are
+    replaced rather than modified, so an edited frame misses the cache; a weak reference to the entry
+    guards against its id being reused by a later object.
+    """
+
+    def __init__(self, budget_bytes):
+        self.budget_bytes = budget_bytes
+        self.nbytes = 0
+        self._entries = OrderedDict()  # key -> (weakref to entry, value, nbytes)
+        self._lock = threading.Lock()
+
+    def get(self, entry, *key):
+        key = (id(entry),) + key
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is None:
+                return None
+            if cached[0]() is not entry:
+                self.nbytes -= self._entries.pop(key)[2]
+                return None
+            self._entries.move_to_end(key)
+            return cached[1]
+
+    def put(self, entry, value, nbytes, *key):
+        key = (id(entry),) + key
+        with self._lock:
+            if key in self._entries:
+                self.nbytes -= self._entries.pop(key)[2]
+            self._entries[key] = (weakref.ref(entry), value, nbytes)
+            self.nbytes += nbytes
+            while self.nbytes > self.budget_bytes and len(self._entries) > 1:
+                self.nbytes -= self._entries.popitem(last=False)[1][2]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+def make_thumbnail(image, size):
+    """Return an RGBA thumbnail of image that fits into size."""
+    thumbnail = image.convert("RGBA")  # reduce() does not support palette images
+    factor = max(1, min(image.width // size[0], image.height // size[1]))
+    if factor > 1:
+        thumbnail = thumbnail.reduce(factor)  # Cheap box reduction before the final filtered resize
+    thumbnail.thumbnail(size, Image.Resampling.BILINEAR)
+    return thumbnail
+
+class ThumbnailWorker:
+    """
+    Generate frame thumbnails on a background thread.
+
+    Only the most recent request is worked on, so frames that were scrolled past are skipped.
+    Finished thumbnails are collected with results() from the Tk thread.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self._wanted = deque()
+        self._working_on = None
+        self._results = queue.Queue()
+        self._condition = threading.Condition()
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def request(self, entries):
+        """Replace the pending work with thumbnails for entries, in priority order."""
+        with self._condition:
+            self._wanted = deque(entry for entry in entries if entry is not self._working_on)
+            self._condition.notify()
+
+    def busy(self):
+        with self._condition:
+            return bool(self._wanted) or self._working_on is not None or not self._results.empty()
+
+    def results(self):
+        """Return the (entry, thumbnail) pairs finished since the last call."""
+        finished = []
+        while True:
+            try:
+                finished.append(self._results.get_nowait())
+            except queue.Empty:
+                return finished
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._wanted:
+                    self._condition.wait()
+                entry = self._working_on = self._wanted.popleft()
+            try:
+                image = entry.load() if isinstance(entry, FrameRef) else entry
+                self._results.put((entry, make_thumbnail(image, self.size)))
+            except Exception:
+                pass  # A frame that cannot be read keeps its blank thumbnail
+            finally:
+                with self._condition:
+                    self._working_on = None
+
+class PlaybackBuffer:
+    """
+    Ring buffer of previews rendered ahead of playback on a background thread.
+
+    render(index) runs on the producer thread and must be thread safe. The player takes previews in
+    playback order with take(); previews of frames it skipped are dropped from the buffer.
+    """
+
+    def __init__(self, render, frame_count, capacity, key=None):
+        self.key = key  # Whatever the buffer was rendered for, so the player can tell when it is stale
+        self._render = render
+        self._count = frame_count
+        self.capacity = max(1, min(capacity, frame_count))
+        self._ready = {}  # index -> rendered preview
+        self._position = 0
+        self._running = True
+        self._condition = threading.Condition()
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def _ahead(self, index):
+        """Return how many frames after the playback position index comes."""
+        return (index - self._position) % self._count
+
+    def take(self, index):
+        """Return the preview rendered for index, or None if the producer has not reached it yet."""
+        with self._condition:
+            self._position = index
+            for stale in [i for i in self._ready if self._ahead(i) >= self.capacity]:
+                del self._ready[stale]
+            rendered = self._ready.pop(index, None)
+            self._condition.notify()
+            return rendered
+
+    def stop(self):
+        with self._condition:
+            self._running = False
+            self._ready.clear()
+            self._condition.notify()
+
+    def _next_index(self):
+        for offset in range(self.capacity):
+            index = (self._position + offset) % self._count
+            if index not in self._ready:
+                return index
+        return None
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._running and self._next_index() is None:
+                    self._condition.wait()
+                if not self._running:
+                    return
+                index = self._next_index()
+            try:
+                rendered = self._render(index)
+            except Exception:
+                rendered = None  # The frames changed under us, the player renders this one itself
+            with self._condition:
+                if self._running and self._ahead(index) < self.capacity:
+                    self._ready[index] = rendered
+
+# PIXEL KERNELS
+# Vectorized kernels that work in place on (..., H, W, 4) uint8 RGBA arrays.
+
+def luma(rgb):
+    """Return the ITU-R 601-2 luma of an (..., 3) uint8 array exactly as Image.convert("L") computes it."""
+    rgb = rgb.astype(np.uint32)
+    return ((rgb[..., 0] * 19595 + rgb[..., 1] * 38470 + rgb[..., 2] * 7471 + 0x8000) >> 16).astype(np.uint8)
+
+class ToneCurve:
+    """
+    A chain of tonal adjustments fused into one per-channel RGBA lookup table.
+
+    Adjustments are composed as (4, 256) tables, so a chain of any length costs a single cv2.LUT pass
+    per frame. Contrast blends against the mean gray of the frame, so the tables composed before it are
+    applied first and it starts a new pass. Desaturation mixes channels and cannot be a table,
+    so it splits the chain in two passes as well.
+    """
+
+    IDENTITY = np.tile(np.arange(256, dtype=np.uint8), (4, 1))
+
+    def __init__(self):
+        self.stages = []  # ('table', (4, 256) uint8 array), ('contrast', factor) or ('desaturate', None)
+
+    def table(self, table):
+        self.stages.append(('table', np.asarray(table, dtype=np.uint8)))
+        return self
+
+    def brightness(self, factor):
+        """Scale the color channels like ImageEnhance.Brightness."""
+        table = self.IDENTITY.copy()
+        table[:3] = self._blend(0, factor)
+        return self.table(table)
+
+    def contrast(self, factor):
+        """Blend the color channels with the mean gray of the frame like ImageEnhance.Contrast."""
+        self.stages.append(('contrast', factor))
+        return self
+
+    def invert(self):
+        """Invert the color channels. Transparency is dropped, as with ImageOps.invert on an RGB copy."""
+        table = 255 - self.IDENTITY
+        table[3] = 255
+        return self.table(table)
+
+    def tint(self, color, intensity):
+        """Move each color channel towards color by intensity percent, keeping transparency."""
+        table = self.IDENTITY.copy()
+        values = np.arange(256, dtype=np.float64)
+        for channel, target in enumerate(color):
+            table[channel] = values + (target - values) * (intensity / 100.0)
+        return self.table(table)
+
+    def scale_alpha(self, factor):
+        """Scale the alpha channel like ImageEnhance.Brightness on the alpha band."""
+        table = self.IDENTITY.copy()
+        table[3] = self._blend(0, factor)
+        return self.table(table)
+
+    def desaturate(self):
+        """Replace the color channels with their luma. Transparency is dropped, as with convert("L")."""
+        self.stages.append(('desaturate', None))
+        return self
+
+    def apply(self, pixels):
+        """Apply the chain in place to an (H, W, 4) uint8 RGBA frame or an (N, H, W, 4) batch of frames."""
+        if pixels.ndim == 4 and any(kind == 'contrast' for kind, value in self.stages):
+            for frame in pixels:  # The contrast table depends on the mean gray of each frame
+                self.apply(frame)
+            return
+        composed = self.IDENTITY
+        for kind, value in self.stages:
+            if kind == 'table':
+                composed = np.take_along_axis(value, composed.astype(np.intp), axis=1)
+            elif kind == 'contrast':
+                self._lookup(pixels, composed)  # The mean is taken over the gray of the adjusted pixels
+                histogram = np.bincount(luma(pixels[..., :3]).ravel(), minlength=256)
+                mean = int(histogram @ np.arange(256) / histogram.sum() + 0.5)
+                composed = self.IDENTITY.copy()
+                composed[:3] = self._blend(mean, value)
+            else:
+                self._lookup(pixels, composed)
+                pixels[..., :3] = luma(pixels[..., :3])[..., np.newaxis]
+                pixels[..., 3] = 255
+                composed = self.IDENTITY
+        self._lookup(pixels, composed)
+
+    def __call__(self, pixels, index=None):
+        """Apply the chain as a pixel kernel."""
+        self.apply(pixels)
+
+    def then(self, other):
+        """Return a new curve that applies this chain followed by other."""
+        curve = ToneCurve()
+        curve.stages = self.stages + other.stages
+        return curve
+
+    def apply_image(self, image):
+        """Return a copy of image with the chain applied."""
+        pixels = np.array(image.convert("RGBA"))
+        self.apply(pixels)
+        return Image.fromarray(pixels, "RGBA")
+
+    @staticmethod
+    def _blend(degenerate, factor):
+        """Return the table of Image.blend from a flat degenerate value, rounded in float32 as Pillow does."""
+        values = np.float32(degenerate) + np.float32(factor) * (np.arange(256, dtype=np.float32) - np.float32(degenerate))
+        return np.clip(values, 0, 255).astype(np.uint8)
+
+    def _lookup(self, pixels, composed):
+        if composed is not self.IDENTITY:
+            rows = pixels.reshape(-1, pixels.shape[-2], 4)  # cv2 takes at most three dimensions, batches are stacked
+            cv2.LUT(rows, np.ascontiguousarray(composed.T).reshape(256, 1, 4), dst=rows)
+
+def frame_generator(seed, frame_index):
+    """Return the random generator of one frame, an independent stream derived from the effect seed."""
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(frame_index,)))
+
+def noise_kernel(pixels, intensity, rng):
+    """
+    Add gray noise of up to +-intensity to width * height * intensity / 100 random pixels of one frame.
+
+    Pixels hit more than once accumulate their noise before clipping. Transparency is kept.
+    """
+    height, width = pixels.shape[:2]
+    count = width * height * intensity // 100
+    if not count:
+        return
+    offsets = np.zeros((height, width), dtype=np.int32)
+    np.add.at(offsets, (rng.integers(0, height, count), rng.integers(0, width, count)), rng.integers(-intensity, intensity + 1, count, dtype=np.int32))
+    np.clip(pixels[..., :3] + offsets[..., np.newaxis], 0, 255, out=pixels[..., :3], casting='unsafe')
+
+SEPIA_MATRIX = np.array([
+    [0.393, 0.769, 0.189],
+    [0.349, 0.686, 0.168],
+    [0.272, 0.534, 0.131],
+])
+
+def sepia_kernel(pixels, intensity):
+    """Apply the sepia color matrix scaled by intensity, keeping transparency."""
+    toned = np.floor(pixels[..., :3] @ SEPIA_MATRIX.T)
+    pixels[..., :3] = np.minimum(255, np.floor(toned * intensity))
+
+def shift_kernel(pixels, dx, dy):
+    """Move the content of one frame by (dx, dy), leaving the uncovered border transparent."""
+    height, width = pixels.shape[:2]
+    moved = np.zeros_like(pixels)
+    if abs(dx) < width and abs(dy) < height:
+        moved[max(0, dy):height + min(0, dy), max(0, dx):width + min(0, dx)] = pixels[max(0, -dy):height - max(0, dy), max(0, -dx):width - max(0, dx)]
+    pixels[...] = moved
+
+def scratch_coordinates(rng, width, height, count):
+    """Return the pixel coordinates of count short, nearly vertical film scratches."""
+    starts_x = rng.integers(0, width, count)
+    starts_y = rng.integers(0, height, count)
+    lengths = rng.integers(20, 101, count)
+    angles = rng.uniform(-0.5, 0.5, count)
+    steps = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    xs = (np.repeat(starts_x, lengths) + steps * np.repeat(angles, lengths)).astype(np.int64)
+    ys = np.repeat(starts_y, lengths) + steps
+    inside = (xs >= 0) & (xs < width) & (ys < height)
+    return ys[inside], xs[inside]
+
+def kinetoscope_kernel(pixels, rng, noise_intensity, scratches, scratches_color, sepia_intensity, max_jitter, lines_intensity, lines_color):
+    """Apply the whole old film chain, noise, scratches, sepia, jitter and vertical lines, to one frame."""
+    height, width = pixels.shape[:2]
+    noise_kernel(pixels, noise_intensity, rng)
+    pixels[scratch_coordinates(rng, width, height, scratches)] = scratches_color + (255,)
+    sepia_kernel(pixels, sepia_intensity)
+    shift_kernel(pixels, *rng.integers(-max_jitter, max_jitter + 1, 2))
+    pixels[:, rng.integers(0, width, max(1, int(width * lines_intensity / 100)))] = lines_color + (255,)
+
+def glitch_kernel(pixels, rng):
+    """Apply the random glitch to one frame: channel shifts, blurred displacement, gray speckles and grainy bands."""
+    height, width = pixels.shape[:2]
+
+    # Chromatic aberration, each color channel is moved by up to three pixels
+    for channel in range(3):
+        dx, dy = np.rint(rng.uniform(-3, 3, 2)).astype(int)
+        shift_kernel(pixels[..., channel], -dx, -dy)
+
+    # Displacement, about half the frame shows a blurred copy. Mask and blur are computed at half resolution.
+    image = Image.fromarray(pixels[..., :3])
+    blurred = image.reduce(2).filter(ImageFilter.GaussianBlur(2.5)).resize((width, height), Image.Resampling.BILINEAR)
+    mask = rng.random(((height + 1) // 2, (width + 1) // 2)) < 0.5
+    mask = mask.repeat(2, axis=0).repeat(2, axis=1)[:height, :width]
+    np.copyto(pixels[..., :3], np.asarray(blurred), where=mask[..., np.newaxis])
+
+    # Gray speckles
+    count = rng.integers(1000, 3001)
+    pixels[rng.integers(0, height, count), rng.integers(0, width, count), :3] = rng.integers(50, 201, count, dtype=np.uint8)[:, np.newaxis]
+
+    # Horizontal gray bands with grain
+    for _ in range(rng.integers(5, 21)):
+        top = rng.integers(0, height)
+        band = pixels[top:top + rng.integers(1, 4), :, :3]
+        gray = rng.integers(50, 201) + rng.integers(-20, 21, band.shape[:2])
+        band[...] = np.clip(gray, 0, 255)[..., np.newaxis]
+
+    pixels[..., 3] = 255  # The glitch works on the RGB image, transparency is dropped
+
+@functools.lru_cache(maxsize=4)
+def halftone_stamps(cell, shape):
+    """
+    Return a table of anti-aliased halftone stamps for one cell size.
+
+    Stamp k of the (levels, cell, cell) uint8 table is a black dot or square on white that grows from
+    the top left corner of the cell to cell * k / (levels - 1) pixels.
+    """
+    levels = min(256, 4 * cell + 1)
+    supersampling = 4 if cell <= 64 else 1
+    centers = (np.arange(cell * supersampling) + 0.5) / supersampling
+    stamps = np.empty((levels, cell, cell), dtype=np.uint8)
+    for k, size in enumerate(np.linspace(0, cell, levels)):
+        if shape == "dot":
+            radius = size / 2
+            inside = (centers[:, np.newaxis] - radius) ** 2 + (centers[np.newaxis, :] - radius) ** 2 <= radius ** 2
+        else:
+            inside = (centers[:, np.newaxis] < size) & (centers[np.newaxis, :] < size)
+        coverage = inside.reshape(cell, supersampling, cell, supersampling).mean(axis=(1, 3))
+        stamps[k] = np.rint(255 * (1 - coverage))
+    stamps.flags.writeable = False
+    return stamps
+
+def halftone_kernel(pixels, cell, shape):
+    """Render frames as black halftone dots or squares on white, one stamp per cell sized by the cell's darkness."""
+    batch, (height, width) = pixels.shape[:-3], pixels.shape[-3:-1]
+    rows, cols = -(-height // cell), -(-width // cell)
+
+    # Mean brightness of every cell in one block reduction, edge cells only count their real pixels
+    padded = np.zeros(batch + (rows * cell, cols * cell), dtype=np.float32)
+    padded[..., :height, :width] = luma(pixels[..., :3])
+    sums = padded.reshape(batch + (rows, cell, cols, cell)).sum(axis=(-3, -1))
+    counts = np.outer(np.minimum(cell, height - np.arange(rows) * cell), np.minimum(cell, width - np.arange(cols) * cell))
+    darkness = 1 - sums / counts / 255
+
+    stamps = halftone_stamps(cell, shape)
+    tiles = stamps[np.rint(darkness * (len(stamps) - 1)).astype(np.intp)]
+    halftone = tiles.swapaxes(-3, -2).reshape(batch + (rows * cell, cols * cell))[..., :height, :width]
+    pixels[..., :3] = halftone[..., np.newaxis]
+    pixels[..., 3] = 255
+
+def hue_lut(hue_shift):
+    """Return an HSV lookup table for Image.point that rotates hue by hue_shift degrees. Pillow stores hue as 0-255."""
+    hue = (np.arange(256) + np.rint(hue_shift * 256 / 360).astype(int)) % 256
+    return np.concatenate([hue, np.arange(256), np.arange(256)]).tolist()
+
+def speed_blur_kernel(pixels, count, direction):
+    """Evenly average a frame with count copies of itself moved 2, 4, ... pixels towards direction, in one pass."""
+    axis = 1 if direction in ("left", "right") else 0
+    data = np.moveaxis(pixels, axis, 0)
+    if direction in ("left", "top"):
+        data = data[::-1]
+
+    # Running sums over every second pixel give each window of count + 1 copies by one subtraction
+    span = 2 * (count + 1)
+    padded = np.zeros((span + len(data),) + data.shape[1:], dtype=np.float32)
+    padded[span:] = data
+    sums = np.empty_like(padded)
+    np.cumsum(padded[0::2], axis=0, out=sums[0::2])
+    np.cumsum(padded[1::2], axis=0, out=sums[1::2])
+    data[...] = np.rint((sums[span:] - sums[:-span]) / (count + 1))
+
+def zoom_blur_kernel(pixels, count):
+    """
+    Evenly average a frame with count or more copies of itself zoomed up to 1 + count / 100 times.
+
+    The zoom factors are spaced geometrically, so the 2 ** m copies are averaged by m passes that each
+    blend the running result with a zoomed copy of itself.
+    """
+    height, width = pixels.shape[:2]
+    passes = max(1, math.ceil(math.log2(count + 1)))
+    ratio = (1 + count * 0.01) ** (1 / (2 ** passes - 1))
+    center_x, center_y = (width - 1) / 2, (height - 1) / 2
+    blurred = pixels.astype(np.float32)
+    for p in range(passes):
+        zoom = ratio ** (2 ** p)
+        matrix = np.float32([[zoom, 0, center_x * (1 - zoom)], [0, zoom, center_y * (1 - zoom)]])
+        zoomed = cv2.warpAffine(blurred, matrix, (width, height), flags=cv2.INTER_LINEAR, borderMode=cv2.BORDER_REPLICATE)
+        blurred += zoomed
+        blurred *= 0.5
+    pixels[...] = np.clip(np.rint(blurred), 0, 255)
+
+@functools.lru_cache(maxsize=4)
+def vignette_overlay(size, shape, intensity, color):
+    """
+    Return a vignette as premultiplied color and alpha float32 arrays.
+
+    The round vignette fades with the distance from the center, the square one with the Chebyshev
+    distance. Results are cached, so a selection of same-size frames builds the mask once.
+    """
+    width, height = size
+    dx = np.abs(np.arange(width) - width / 2)
+    dy = np.abs(np.arange(height) - height / 2)[:, np.newaxis]
+    if shape == "round":
+        distance = np.sqrt(dx ** 2 + dy ** 2) / np.sqrt((width / 2) ** 2 + (height / 2) ** 2)
+    else:
+        distance = np.maximum(dx, dy) / (max(width, height) / 2)
+    alpha = np.minimum(255, (255 * distance * (intensity / 100)).astype(np.int32)).astype(np.float32) / 255
+    premultiplied = alpha[..., np.newaxis] * np.array(ImageColor.getrgb(color), dtype=np.float32)
+    alpha.flags.writeable = premultiplied.flags.writeable = False
+    return premultiplied, alpha
+
+def overlay_kernel(pixels, premultiplied, alpha):
+    """Alpha composite an overlay, given as premultiplied color and alpha, over the pixels."""
+    behind = pixels[..., 3] * (1 - alpha) / np.float32(255)
+    out_alpha = alpha + behind
+    color = premultiplied + pixels[..., :3] * behind[..., np.newaxis]
+    np.divide(color, out_alpha[..., np.newaxis], out=color, where=out_alpha[..., np.newaxis] > 0)
+    pixels[..., :3] = np.clip(color + 0.5, 0, 255)
+    pixels[..., 3] = np.clip(out_alpha * 255 + 0.5, 0, 255)
+
+class PixelEffect:
+    """A frame effect that runs a pixel kernel, kernel(pixels, frame_index), in place on an (H, W, 4) RGBA copy of the frame."""
+
+    def __init__(self, kernel):
+        self.kernel = kernel
+
+    def __call__(self, frame, index):
+        pixels = np.array(frame.convert("RGBA"))
+        self.kernel(pixels, index)
+        return Image.frombuffer("RGBA", frame.size, pixels, "raw", "RGBA", 0, 1)
+
+def seeded_kernel(kernel, seed, pixels, index, **kwargs):
+    """Run kernel(pixels, rng=..., **kwargs) with the random stream of the frame. Picklable through functools.partial."""
+    kernel(pixels, rng=frame_generator(seed, index), **kwargs)
+
+def hsl_effect(hue_shift, saturation_factor, lightness_factor):
+    """Return a frame effect that shifts the hue in degrees and scales saturation and lightness."""
+    lut = hue_lut(hue_shift)
+    lightness = ToneCurve().brightness(lightness_factor)
+
+    def adjust(frame, i):
+        frame = frame.convert("RGB")
+
+        # Adjust Hue
+        if hue_shift:
+            frame = frame.convert("HSV").point(lut).convert("RGB")
+
+        # Adjust Saturation
+        enhancer = ImageEnhance.Color(frame)
+        frame = enhancer.enhance(saturation_factor)
+
+        # Adjust Lightness, the lookup pass also converts back to RGBA
+        return lightness.apply_image(frame)
+
+    return adjust
+
+def vignette_effect(shape, intensity, color):
+    """Return a PixelEffect that darkens the edges towards color, the overlay is cached per frame size."""
+    def vignette_kernel(pixels, i):
+        premultiplied, alpha = vignette_overlay(pixels.shape[-2:-4:-1], shape, intensity, color)
+        overlay_kernel(pixels, premultiplied, alpha)
+
+    return PixelEffect(vignette_kernel)
+
+def pixelate_effect(pixel_size):
+    """Return a frame effect that turns blocks of pixel_size pixels into single colors."""
+    def pixelate(frame, i):
+        width, height = frame.size
+
+        # Validate that the pixel size is not too large for the image dimensions
+        if pixel_size > width or pixel_size > height:
+            raise ValueError("Pixel size too large for the image dimensions.")
+
+        # Resize down to pixel size and back up to original size
+        small_frame = frame.resize((max(width // pixel_size, 1), max(height // pixel_size, 1)), Image.NEAREST)
+        return small_frame.resize(frame.size, Image.NEAREST)
+
+    return pixelate
+
+class FusedKernel:
+    """Several pixel kernels run one after another on the same array. Adjacent ToneCurves are merged into one."""
+
+    def __init__(self, kernels):
+        self.kernels = []
+        for kernel in kernels:
+            if isinstance(kernel, FusedKernel):
+                self.kernels.extend(kernel.kernels)
+            elif isinstance(kernel, ToneCurve) and self.kernels and isinstance(self.kernels[-1], ToneCurve):
+                self.kernels[-1] = self.kernels[-1].then(kernel)
+            else:
+                self.kernels.append(kernel)
+
+    def __call__(self, pixels, index):
+        for kernel in self.kernels:
+            kernel(pixels, index)
+
+class EffectRecipe:
+    """
+    A queue of frame effects that is applied as a single effect, in one pass per frame.
+
+    Adjacent PixelEffects are fused into one FusedKernel working on a single RGBA array, so no
+    intermediate image is made between them. Only effects that work on PIL images get an image of
+    their own.
+    """
+
+    def __init__(self):
+        self.stages = []  # PixelEffects and PIL effects, adjacent pixel kernels already fused
+        self.processes = False
+        self.count = 0
+
+    def add(self, effect, processes=False):
+        """Queue an effect, processes tells whether it asked for the process pool."""
+        if isinstance(effect, PixelEffect) and self.stages and isinstance(self.stages[-1], PixelEffect):
+            self.stages[-1] = PixelEffect(FusedKernel([self.stages[-1].kernel, effect.kernel]))
+        else:
+            self.stages.append(effect)
+        self.processes = self.processes or processes
+        self.count += 1
+
+    def compile(self):
+        """Return a frame effect for the whole recipe. A recipe of pixel kernels only stays a PixelEffect."""
+        return self.stages[0] if len(self.stages) == 1 else self
+
+    def __call__(self, frame, index):
+        for stage in self.stages:
+            frame = stage(frame, index)
+        return frame
+
+class EffectParameters:
+    """The answers an effect command got from its parameter prompts and the random seeds it drew, in order."""
+
+    def __init__(self, answers=(), seeds=()):
+        self.answers = list(answers)
+        self.seeds = list(seeds)
+
+class EffectLayer:
+    """
+    One editable effect of a non-destructive effect stack.
+
+    Layers are never modified: editing one replaces it by a new layer with a new serial number, so the
+    cached stages rendered through it miss the cache while the stages below it are reused.
+    """
+
+    _serials = itertools.count()
+
+    def __init__(self, name, effect, command, parameters):
+        self.name = name
+        self.effect = effect  # Frame effect, called as effect(frame, frame_index)
+        self.command = command  # Editor method that prompts for the parameters and builds the effect
+        self.parameters = parameters  # EffectParameters that the command is run with again when the layer is edited
+        self.serial = next(self._serials)
+
+class StackedFrame(FrameRef):
+    """
+    Frame rendered on demand from a base entry through a stack of effect layers.
+
+    Every stage of the rendering is kept in a FrameImageCache under the serials of the layers that
+    produced it, so after a layer is edited only the stages from that layer up are rendered again, and
+    only for the frames that are actually displayed or exported.
+    """
+
+    def __init__(self, base, layers, index, cache):
+        self.base = base  # Entry of the frame list the stack is applied to, never a StackedFrame
+        self.layers = tuple(layers)
+        self.index = index  # Frame index passed to the effects, fixed when the stack was created
+        self.cache = cache
+
+    def load(self):
+        """Return the output of the top layer, rendering the stages that are not cached."""
+        serials = tuple(layer.serial for layer in self.layers)
+        depth = len(serials)
+        image = None
+        while depth and image is None:
+            image = self.cache.get(self.base, *serials[:depth])
+            if image is None:
+                depth -= 1
+        if image is None:
+            image = self.base.load() if isinstance(self.base, FrameRef) else self.base
+
+        for layer in self.layers[depth:]:
+            depth += 1
+            image = layer.effect(image, self.index)
+            self.cache.put(self.base, image, image_nbytes(image), *serials[:depth])
+        return image
+
+    def with_layers(self, layers):
+        """Return the same frame with another stack, sharing the cached stages."""
+        return StackedFrame(self.base, layers, self.index, self.cache)
+
+def run_frame_effect(effect, frame, index):
+    """Resolve a frame list entry and apply a frame effect to it, on a pool worker."""
+    if isinstance(frame, FrameRef):
+        frame = frame.load()
+    return effect(frame, index)
+
+def run_shared_pixel_kernel(kernel, handle, slot, index):
+    """Run a pixel kernel in place on one frame of a SharedFrameArena, in a worker process."""
+    memory = shared_memory.SharedMemory(name=handle[0])  # Pool workers share the resource tracker of the creating process
+    try:
+        frames = np.ndarray(handle[1], dtype=np.uint8, buffer=memory.buf)
+        kernel(frames[slot], index)
+        del frames  # Release the view before the block is closed
+    finally:
+        memory.close()
 
 class GIFEditor:
     def __init__(self, master):
@@ -20,11 +1339,13 @@ class GIFEditor:
 
         # Initial settings
         self.frame_index = 0
-        self.frames = []
+        self.frames = FrameList()
         self.delays = []
         self.is_playing = False
-        self.history = []
-        self.redo_stack = []
+        self.playback_after_id = None
+        self.playback_buffer = None
+        self.playback_buffer_budget = 64 << 20  # Bytes of previews rendered ahead of playback
+        self.history = UndoHistory()
         self.current_file = None
         self.checkbox_vars = []
         self.check_all = tk.BooleanVar(value=False)
@@ -32,6 +1353,29 @@ class GIFEditor:
         self.preview_width = 200
         self.preview_height = 150
 
+        # Frame list thumbnails, rendered off the Tk thread
+        self.thumbnail_size = (48, 36)
+        self.thumbnail_cache = FrameImageCache(32 << 20)
+        self.thumbnail_worker = ThumbnailWorker(self.thumbnail_size)
+        self.thumbnail_poll_id = None
+
+        # Resized previews shown by show_frame
+        self.preview_cache = FrameImageCache(64 << 20)
+
+        # Disk-backed storage settings
+        self.disk_backed_storage = tk.BooleanVar(value=False)
+        self.frame_stores = {}  # One MappedFrameStore per frame size
+
+        # Worker pools shared by effects and imports, started on first use
+        self.thread_pool = None
+        self.process_pool = None  # For effects that hold the GIL
+        self.stack_cache = FrameImageCache(256 * 1024 * 1024)  # Rendered stages of StackedFrame entries
+        self.effect_capture = None  # List that receives the effect of a command run by capture_frame_effect
+        self.effect_parameters = None  # EffectParameters recorded while capture_frame_effect runs
+        self.previous_parameters = None  # EffectParameters offered as the initial values of the prompts
+        self.recipe = None  # EffectRecipe being recorded, frame effects are queued into it instead of applied
+        self.recording_recipe = tk.BooleanVar(value=False)
+
         # Draw mode settings
         self.is_draw_mode = False
         self.brush_color = "#000000"
@@ -87,6 +1431,8 @@ class GIFEditor:
         file_menu.add_command(label="Extract Video Frames", command=self.extract_video_frames)
         file_menu.add_command(label="Extract Frames Gif", command=self.extract_frames_gif)
         file_menu.add_separator()
+        file_menu.add_checkbutton(label="Disk-Backed Frame Storage", variable=self.disk_backed_storage, command=self.toggle_disk_backed_storage)
+        file_menu.add_separator()
         file_menu.add_command(label="Exit", command=self.exit_closing)
         self.menu_bar.add_cascade(label="File", menu=file_menu)
 
@@ -95,6 +1441,7 @@ class GIFEditor:
         edit_menu = Menu(self.menu_bar, tearoff=0)
         edit_menu.add_command(label="Undo", command=self.undo, accelerator="Ctrl+Z")
         edit_menu.add_command(label="Redo", command=self.redo, accelerator="Ctrl+Y")
+        edit_menu.add_command(label="Undo Memory Budget...", command=self.set_undo_memory_budget)
         edit_menu.add_separator()
         edit_menu.add_command(label="Copy", command=self.copy_frames, accelerator="Ctrl+C")
         edit_menu.add_command(label="Paste", command=self.paste_frames, accelerator="Ctrl+V")
@@ -171,6 +1518,42 @@ class GIFEditor:
         effects_menu.add_command(label="Pixelate Effect", command=self.apply_pixelate_effect)
         effects_menu.add_command(label="Reduce Transparency", command=self.reduce_transparency_of_checked_frames)
         effects_menu.add_command(label="Slide Transition Effect", command=self.slide_transition_effect)
+        effects_menu.add_separator()
+        effects_menu.add_command(label="Effect Preview...", command=self.open_effect_preview)
+        stackable_effects = [
+            ("Desaturate", self.desaturate_frames),
+            ("Sharpness", self.apply_sharpening_effect),
+            ("Strange Sharpness", self.apply_strange_sharpening_effect),
+            ("Posterize", self.apply_posterize_effect),
+            ("Halftones", self.apply_halftones_effect),
+            ("Vignette", self.apply_vignette_effect),
+            ("Ghost Detection", self.ghost_detection_effect),
+            ("Anaglyph (3D)", self.apply_anaglyph_effect),
+            ("Kinetoscope", self.apply_kinetoscope_effect),
+            ("Invert Colors", self.invert_colors_of_selected_frames),
+            ("Glitch", self.apply_random_glitch_effect),
+            ("Sketch", self.apply_sketch_effect),
+            ("Tint", self.apply_tint),
+            ("Brightness and Contrast", self.prompt_and_apply_brightness_contrast),
+            ("Hue, Saturation, and Lightness", self.adjust_hsl),
+            ("Zoom", self.apply_zoom_effect),
+            ("Blur", self.apply_blur_effect),
+            ("Zoom and Speed Blur", self.apply_zoom_and_speed_blur_effect),
+            ("Noise", self.apply_noise_effect),
+            ("Pixelate", self.apply_pixelate_effect),
+            ("Reduce Transparency", self.reduce_transparency_of_checked_frames),
+        ]
+        stack_menu = Menu(effects_menu, tearoff=0)
+        add_layer_menu = Menu(stack_menu, tearoff=0)
+        for name, command in stackable_effects:
+            add_layer_menu.add_command(label=name, command=lambda name=name, command=command: self.add_effect_layer(name, command))
+        stack_menu.add_cascade(label="Add Layer", menu=add_layer_menu)
+        stack_menu.add_command(label="Edit Layer...", command=self.edit_effect_layer)
+        stack_menu.add_command(label="Remove Top Layer", command=self.remove_effect_layer)
+        stack_menu.add_command(label="Flatten Stack", command=self.flatten_effect_stack)
+        effects_menu.add_cascade(label="Effect Stack", menu=stack_menu)
+        effects_menu.add_checkbutton(label="Record Recipe", variable=self.recording_recipe, command=self.toggle_recipe_recording)
+        effects_menu.add_command(label="Apply Recipe", command=self.apply_recipe)
         self.menu_bar.add_cascade(label="Effects", menu=effects_menu)
 
     def create_animation_menu(self):
@@ -202,6 +1585,460 @@ class GIFEditor:
             messagebox.showwarning("No Frame Selected", "No frames are selected. Please select a frame to apply the effect.")
             return False
 
+    def open_effect_preview(self):
+        """
+        Open a panel that previews an effect on a downscaled proxy of the current frame while its sliders move.
+
+        Only the proxy is rendered while the parameters change, spatial parameters are scaled down with
+        it so the preview matches the full-size result. The selected frames are rendered at full
+        resolution on Apply, or get the effect as a layer of their effect stacks.
+        """
+        if not self.frames:
+            messagebox.showinfo("Effect Preview", "There are no frames to preview.")
+            return
+
+        frame = self.frames[self.frame_index]
+        proxy = make_thumbnail(frame, (480, 360))
+        scale = proxy.width / frame.width
+        seed = random.randrange(2 ** 32)  # Keep the previewed noise for Apply
+
+        # Effect name: (sliders as (label, from, to, resolution, default), build(values, scale), prompt command)
+        previews = {
+            "Brightness and Contrast": (
+                [("Brightness", 0.0, 2.0, 0.01, 1.0), ("Contrast", 0.0, 2.0, 0.01, 1.0)],
+                lambda v, scale: PixelEffect(ToneCurve().brightness(v[0]).contrast(v[1])),
+                self.prompt_and_apply_brightness_contrast),
+            "Hue, Saturation, and Lightness": (
+                [("Hue Shift", -180, 180, 1, 0), ("Saturation", 0.0, 2.0, 0.01, 1.0), ("Lightness", 0.0, 2.0, 0.01, 1.0)],
+                lambda v, scale: hsl_effect(v[0], v[1], v[2]),
+                self.adjust_hsl),
+            "Sharpness": (
+                [("Intensity", 1.0, 20.0, 0.1, 2.0)],
+                lambda v, scale: lambda frame, i: ImageEnhance.Sharpness(frame).enhance(v[0]),
+                self.apply_sharpening_effect),
+            "Blur": (
+                [("Intensity", 0, 100, 1, 2)],
+                lambda v, scale: lambda frame, i: frame.filter(ImageFilter.GaussianBlur(v[0] * scale)),
+                self.apply_blur_effect),
+            "Pixelate": (
+                [("Pixel Size", 1, 100, 1, 10)],
+                lambda v, scale: pixelate_effect(max(1, round(v[0] * scale))),
+                self.apply_pixelate_effect),
+            "Halftones": (
+                [("Intensity", 1, 100, 1, 10)],
+                lambda v, scale: PixelEffect(
+                    lambda pixels, i: halftone_kernel(pixels, max(2, round(int(256 / v[0]) * scale)), "dot")),
+                self.apply_halftones_effect),
+            "Vignette": (
+                [("Intensity", 1, 100, 1, 50)],
+                lambda v, scale: vignette_effect("round", int(v[0]), "#000000"),
+                self.apply_vignette_effect),
+            "Noise": (
+                [("Intensity", 1, 255, 1, 30)],
+                lambda v, scale: PixelEffect(functools.partial(seeded_kernel, noise_kernel, seed, intensity=int(v[0]))),
+                self.apply_noise_effect),
+        }
+
+        # Slider values as answers to the prompts of the command, in its order, so the layer can be edited
+        prompt_answers = {
+            "Blur": lambda v: [int(v[0])],
+            "Pixelate": lambda v: [int(v[0])],
+            "Halftones": lambda v: [int(v[0]), "dot"],
+            "Vignette": lambda v: [int(v[0]), (None, "#000000"), "round"],
+            "Noise": lambda v: [int(v[0]), seed],
+        }
+
+        preview_window = tk.Toplevel(self.master)
+        preview_window.title("Effect Preview")
+        effect_var = tk.StringVar(value=next(iter(previews)))
+        effect_box = ttk.Combobox(preview_window, textvariable=effect_var, values=list(previews), state="readonly")
+        effect_box.pack(fill=tk.X, padx=10, pady=5)
+        sliders_frame = Frame(preview_window)
+        sliders_frame.pack(fill=tk.X, padx=10)
+        preview_label = tk.Label(preview_window)
+        preview_label.pack(padx=10, pady=5)
+        status_var = tk.StringVar()
+        tk.Label(preview_window, textvariable=status_var).pack()
+        buttons_frame = Frame(preview_window)
+        buttons_frame.pack(pady=5)
+
+        slider_vars = []
+        pending_id = None
+
+        def build_effect(scale):
+            sliders, build, command = previews[effect_var.get()]
+            return build([var.get() for var in slider_vars], scale)
+
+        def render():
+            nonlocal pending_id
+            pending_id = None
+            start = time.perf_counter()
+            try:
+                image = build_effect(scale)(proxy, self.frame_index)
+            except Exception as e:
+                status_var.set(f"Preview failed: {e}")
+                return
+            photo = ImageTk.PhotoImage(image)
+            preview_label.config(image=photo)
+            preview_label.image = photo  # Keep a reference to avoid garbage collection
+            status_var.set(f"Preview rendered in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+        def schedule_render(*args):
+            nonlocal pending_id
+            if pending_id is None:  # Slider moves that arrive before the next render are coalesced
+                pending_id = preview_window.after_idle(render)
+
+        def select_effect(*args):
+            for child in sliders_frame.winfo_children():
+                child.destroy()
+            slider_vars.clear()
+            for label, low, high, resolution, default in previews[effect_var.get()][0]:
+                var = tk.DoubleVar(value=default)
+                tk.Scale(sliders_frame, label=label, from_=low, to=high, resolution=resolution, orient=tk.HORIZONTAL,
+                         length=300, variable=var, command=schedule_render).pack(fill=tk.X)
+                slider_vars.append(var)
+            schedule_render()
+
+        def close():
+            if pending_id is not None:
+                preview_window.after_cancel(pending_id)
+            preview_window.destroy()
+
+        def apply():
+            if self.check_any_frame_selected():
+                name = effect_var.get()
+                effect = build_effect(1.0)
+                close()
+                self.apply_frame_effect(effect, f"Applying {name}")
+
+        def add_layer():
+            if self.check_any_frame_selected():
+                name = effect_var.get()
+                effect = build_effect(1.0)
+                close()
+                values = [var.get() for var in slider_vars]
+                answers = prompt_answers.get(name, list)(values)
+                self.add_effect_layer(name, previews[name][2], effect, EffectParameters(answers))
+
+        tk.Button(buttons_frame, text="Apply", command=apply).pack(side=tk.LEFT, padx=5)
+        tk.Button(buttons_frame, text="Add Layer", command=add_layer).pack(side=tk.LEFT, padx=5)
+        tk.Button(buttons_frame, text="Close", command=close).pack(side=tk.LEFT, padx=5)
+        preview_window.protocol("WM_DELETE_WINDOW", close)
+        effect_box.bind("<<ComboboxSelected>>", select_effect)
+        select_effect()
+
+    def capture_frame_effect(self, command, previous=None):
+        """
+        Run an effect command for its parameter prompts only.
+
+        Returns the effect it built and the EffectParameters it was built from, or (None, None) if it was
+        cancelled. The prompts and random seeds of the command start from previous, if given.
+        """
+        self.effect_capture = []
+        self.effect_parameters = EffectParameters()
+        self.previous_parameters = previous
+        try:
+            command()
+        finally:
+            captured, self.effect_capture = self.effect_capture, None
+            parameters, self.effect_parameters = self.effect_parameters, None
+            self.previous_parameters = None
+        return (captured[0], parameters) if captured else (None, None)
+
+    def ask(self, prompt, *args, **kwargs):
+        """
+        Show a parameter prompt of an effect, e.g. self.ask(simpledialog.askfloat, title, text).
+
+        While capture_frame_effect runs, the answer is recorded, and the answer at the same position of the
+        previous parameters is offered as the initial value.
+        """
+        if self.effect_parameters is None:
+            return prompt(*args, **kwargs)
+        position = len(self.effect_parameters.answers)
+        previous = self.previous_parameters
+        if previous is not None and position < len(previous.answers) and previous.answers[position] is not None:
+            answer = previous.answers[position]
+            if prompt is colorchooser.askcolor:
+                kwargs['initialcolor'] = answer[1]
+            else:
+                kwargs['initialvalue'] = answer
+        answer = prompt(*args, **kwargs)
+        self.effect_parameters.answers.append(answer)
+        return answer
+
+    def effect_seed(self):
+        """Return a random seed for an effect, or the seed it drew before while one of its layers is edited."""
+        if self.effect_parameters is None:
+            return random.randrange(2 ** 32)
+        position = len(self.effect_parameters.seeds)
+        previous = self.previous_parameters
+        if previous is not None and position < len(previous.seeds):
+            seed = previous.seeds[position]
+        else:
+            seed = random.randrange(2 ** 32)
+        self.effect_parameters.seeds.append(seed)
+        return seed
+
+    def replace_stacks(self, stacks):
+        """Replace frame list entries by StackedFrames, given as {index: (base entry or StackedFrame, layers)}."""
+        self.save_state()  # Save the state before making changes
+        for i, (entry, layers) in stacks.items():
+            if not isinstance(entry, StackedFrame):
+                entry = StackedFrame(entry, (), i, self.stack_cache)
+            self.frames[i] = entry.with_layers(layers) if layers else entry.base
+        self.update_frame_list()
+        self.show_frame()
+
+    def add_effect_layer(self, name, command, effect=None, parameters=None):
+        """Add an effect on top of the effect stack of the selected frames, leaving their pixels untouched."""
+        if not self.check_any_frame_selected():
+            return
+        if effect is None:
+            effect, parameters = self.capture_frame_effect(command)
+            if effect is None:
+                return
+        layer = EffectLayer(name, effect, command, parameters or EffectParameters())
+        stacks = {}
+        for i, var in enumerate(self.checkbox_vars):
+            if var.get():
+                entry = self.frames.raw(i)
+                layers = entry.layers if isinstance(entry, StackedFrame) else ()
+                stacks[i] = (entry, layers + (layer,))
+        self.replace_stacks(stacks)
+
+    def edit_effect_layer(self):
+        """Prompt again for the parameters of a layer of the current frame, in every frame that shares it."""
+        entry = self.frames.raw(self.frame_index) if self.frames else None
+        if not isinstance(entry, StackedFrame):
+            messagebox.showinfo("Edit Layer", "The current frame has no effect layers.")
+            return
+        listing = "\n".join(f"{number}. {layer.name}" for number, layer in enumerate(entry.layers, start=1))
+        number = simpledialog.askinteger(
+            "Edit Layer", f"Layers, from the bottom:\n{listing}\n\nEnter the layer to edit:", minvalue=1, maxvalue=len(entry.layers)
+        )
+        if number is None:
+            return
+        old_layer = entry.layers[number - 1]
+        effect, parameters = self.capture_frame_effect(old_layer.command, old_layer.parameters)
+        if effect is None:
+            return
+        new_layer = EffectLayer(old_layer.name, effect, old_layer.command, parameters)
+
+        stacks = {}
+        for i in range(len(self.frames)):
+            other = self.frames.raw(i)
+            if isinstance(other, StackedFrame) and old_layer in other.layers:
+                stacks[i] = (other, tuple(new_layer if layer is old_layer else layer for layer in other.layers))
+        self.replace_stacks(stacks)
+
+    def remove_effect_layer(self):
+        """Remove the top layer of the effect stack of the selected frames."""
+        if not self.check_any_frame_selected():
+            return
+        stacks = {}
+        for i, var in enumerate(self.checkbox_vars):
+            entry = self.frames.raw(i)
+            if var.get() and isinstance(entry, StackedFrame):
+                stacks[i] = (entry, entry.layers[:-1])
+        if stacks:
+            self.replace_stacks(stacks)
+
+    def flatten_effect_stack(self):
+        """Render the effect stacks of the selected frames into plain frames."""
+        if not self.check_any_frame_selected():
+            return
+        indices = [i for i, var in enumerate(self.checkbox_vars) if var.get() and isinstance(self.frames.raw(i), StackedFrame)]
+        if not indices:
+            return
+        self.save_state()  # Save the state before making changes
+        for i in indices:
+            self.frames[i] = self.store_frame(self.frames[i].copy())
+        self.update_frame_list()
+        self.show_frame()
+
+    def toggle_recipe_recording(self):
+        """Start recording a recipe of effects, or discard the one being recorded."""
+        if self.recording_recipe.get():
+            self.recipe = EffectRecipe()
+            messagebox.showinfo("Record Recipe", "Effects are now queued instead of applied. Use Apply Recipe to run them all in one pass.")
+        else:
+            self.recipe = None
+
+    def apply_recipe(self):
+        """Stop recording and apply the queued effects to the selected frames in one pass per frame."""
+        recipe = self.recipe
+        if recipe is None or not recipe.count:
+            messagebox.showinfo("Apply Recipe", "No effects recorded. Enable Record Recipe and choose effects first.")
+            return
+        if not self.check_any_frame_selected():
+            return
+        self.recipe = None
+        self.recording_recipe.set(False)
+
+        effect = recipe.compile()
+        processes = recipe.processes
+        if processes:
+            try:
+                pickle.dumps(effect)
+            except Exception:
+                processes = False  # A stage built from a closure, run the whole recipe on threads
+        self.apply_frame_effect(effect, f"Applying Recipe ({recipe.count} effects)", processes)
+
+    def apply_frame_effect(self, effect, title="Applying Effect", processes=False):
+        """
+        Map a per-frame effect over the selected frames on a worker pool, with progress and cancel.
+
+        The frame list is only changed once every frame has been processed, with one save_state for the
+        whole selection, so a cancelled or failed run leaves the animation untouched.
+
+        Parameters:
+        - effect (callable): Called on a worker as effect(frame, frame_index), returns the new frame.
+          Pixel kernels are wrapped with PixelEffect.
+        - title (str): Title of the progress window.
+        - processes (bool): Use the process pool for effects that hold the GIL. The effect must then be
+          picklable, e.g. a module-level function or a functools.partial of one. A PixelEffect receives
+          its frames through shared memory instead of pickled images.
+        """
+        if self.effect_capture is not None:
+            self.effect_capture.append(effect)
+            return
+        if self.recipe is not None:
+            self.recipe.add(effect, processes)
+            return
+
+        indices = [i for i, var in enumerate(self.checkbox_vars) if var.get() == 1]
+        if not indices:
+            return
+
+        if processes:
+            if self.process_pool is None:
+                self.process_pool = ProcessPoolExecutor(mp_context=multiprocessing.get_context("spawn"))
+            executor = self.process_pool
+        else:
+            executor = self.get_thread_pool()
+        chunk_size = 4 * (os.cpu_count() or 1)  # Frames in flight, so the selection never has to fit in RAM at once
+        results = []  # Finished frames, already in the frame stores when disk-backed storage is on
+        futures = []
+        arenas = {}
+        slots = []
+        cancel = False
+
+        def cancel_effect():
+            nonlocal cancel
+            cancel = True
+
+        def submit_chunk():
+            """Submit the next chunk of frames, return False after reporting a failure to start it."""
+            nonlocal futures, arenas, slots
+            try:
+                chunk = indices[len(results):len(results) + chunk_size]
+                if processes and isinstance(effect, PixelEffect):
+                    # Pixel kernels work in place on shared memory, one arena per frame size
+                    frames = [self.frames[i] for i in chunk]
+                    arenas = {}
+                    for size, count in Counter(frame.size for frame in frames).items():
+                        arenas[size] = SharedFrameArena(size, count)  # Kept as they are made, so a failure can close them
+                    slots = [(arenas[frame.size], arenas[frame.size].append(frame)) for frame in frames]
+                    futures = [
+                        executor.submit(run_shared_pixel_kernel, effect.kernel, arena.handle, slot, i)
+                        for (arena, slot), i in zip(slots, chunk)
+                    ]
+                elif isinstance(effect, PixelEffect) and isinstance(effect.kernel, ToneCurve):
+                    # Tonal curves do not depend on the frame index, so they run vectorized over batches of a
+                    # FrameArena per frame size, and the results are zero-copy views of the arenas
+                    arenas = {}
+                    slots = []
+                    for frame in (self.frames[i] for i in chunk):
+                        if frame.size not in arenas:
+                            arenas[frame.size] = FrameArena(frame.size)
+                        slots.append((arenas[frame.size], arenas[frame.size].append(frame)))
+                    workers = os.cpu_count() or 1
+                    futures = [executor.submit(effect.kernel.apply, batch) for arena in arenas.values() for batch in arena.batches(workers)]
+                else:
+                    # Frame references cannot cross process boundaries, threads resolve them themselves
+                    frames = [self.frames[i] if processes else self.frames.raw(i) for i in chunk]
+                    futures = [executor.submit(run_frame_effect, effect, frame, i) for frame, i in zip(frames, chunk)]
+                    slots = []
+            except Exception as e:
+                finish()
+                release_arenas()
+                messagebox.showerror("Error", f"An error occurred while applying the effect: {e}")
+                return False
+            return True
+
+        def finish():
+            for future in futures:
+                future.cancel()
+            progress_window.grab_release()
+            progress_window.destroy()
+
+        def release_arenas():
+            for arena in arenas.values():
+                if isinstance(arena, SharedFrameArena):
+                    arena.close()
+            arenas.clear()
+
+        def poll():
+            nonlocal futures
+            if cancel:
+                finish()
+                release_arenas()
+                return
+            done = sum(future.done() for future in futures)
+            progress_var.set((len(results) + done) / len(indices) * 100)
+            if done < len(futures):
+                self.master.after(30, poll)
+                return
+
+            try:
+                chunk_results = [future.result() for future in futures]
+                if slots:
+                    chunk_results = [arena.image(slot) for arena, slot in slots]
+            except Exception as e:
+                finish()
+                messagebox.showerror("Error", f"An error occurred while applying the effect: {e}")
+                return
+            finally:
+                release_arenas()
+            futures = []
+            results.extend(self.store_frame(frame) for frame in chunk_results)
+            if len(results) < len(indices):
+                if submit_chunk():
+                    self.master.after(30, poll)
+                return
+
+            finish()
+            self.save_state()  # Save the state before making changes
+            for i, frame in zip(indices, results):
+                self.frames[i] = frame
+            self.update_frame_list()
+            self.show_frame()
+
+        progress_window, progress_var = self.open_progress_window(title, cancel_effect)
+        if submit_chunk():
+            poll()
+
+    def get_thread_pool(self):
+        """Return the thread pool shared by effects and imports, starting it on first use."""
+        if self.thread_pool is None:
+            self.thread_pool = ThreadPoolExecutor(max_workers=os.cpu_count())
+        return self.thread_pool
+
+    def open_progress_window(self, title, on_cancel):
+        """Open a modal window with a progress bar and a Cancel button, return the window and its progress variable."""
+        progress_window = tk.Toplevel(self.master)
+        progress_window.title(title)
+        progress_window.geometry("300x100")
+        progress_var = tk.DoubleVar()
+        progress_bar = ttk.Progressbar(progress_window, variable=progress_var, maximum=100)
+        progress_bar.pack(expand=True, fill=tk.BOTH, padx=20, pady=20)
+        cancel_button = tk.Button(progress_window, text="Cancel", command=on_cancel)
+        cancel_button.pack(pady=10)
+        progress_window.protocol("WM_DELETE_WINDOW", on_cancel)
+        progress_window.wait_visibility()
+        progress_window.grab_set()  # Keep the frame list unchanged while the work is running
+        return progress_window, progress_var
+
 # MENU FILE
 
     def new_file(self, event=None):
@@ -216,7 +2053,7 @@ class GIFEditor:
                 return
 
         # Reset the editor state for a new file
-        self.frames = []
+        self.frames = FrameList()
         self.delays = []
         self.checkbox_vars = []
         self.current_file = None
@@ -232,27 +2069,11 @@ class GIFEditor:
         if not file_paths:
             return
 
-        self.save_state()  # Save the state before making changes
-
-        try:
-            for file_path in file_paths:
-                with Image.open(file_path) as img:
-                    for frame in ImageSequence.Iterator(img):
-                        if not self.frames:
-                            self.base_size = frame.size  # Store the size of the first frame
-                        resized_frame = self.resize_to_base_size(frame.copy())
-                        self.frames.append(resized_frame)
-                        delay = int(frame.info.get('duration', 100))  # Ensure delay is always an integer
-                        self.delays.append(delay)
-                        var = IntVar()
-                        var.trace_add('write', lambda *args, i=len(self.checkbox_vars): self.set_current_frame(i))
-                        self.checkbox_vars.append(var)
+        def on_complete():
             self.frame_index = 0
-            self.update_frame_list()
-            self.show_frame()
             self.update_title()
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load files: {e}")
+
+        self.import_files(file_paths, decode_image_file, "Loading Files", "Failed to load files", on_complete)
 
     def save(self, event=None):
         """Save the current frames and delays to a GIF file."""
@@ -312,10 +2133,7 @@ class GIFEditor:
                     image.info['transparency'] = image.getpixel((0, 0))
                     images.append(image)
 
-                images[0].save(
-                    file_path, save_all=True, append_images=images[1:],
-                    duration=self.delays, loop=gif_loop_count, disposal=disposal
-                )
+                save_animation(images, file_path, duration=self.delays, loop=gif_loop_count, disposal=disposal)
                 self.current_file = file_path
                 self.update_title()
                 messagebox.showinfo("Success", "High-quality GIF saved successfully!")
@@ -465,22 +2283,13 @@ class GIFEditor:
                 disposal = 2 if dispose_option else 0
                 # Adjust loop count for GIFs: 0 for infinite, 1 for one loop, etc.
                 gif_loop_count = 0 if loop_count == 0 else loop_count
-                self.frames[0].save(
-                    file_path, save_all=True, append_images=self.frames[1:],
-                    duration=self.delays, loop=gif_loop_count, disposal=disposal
-                )
+                save_animation(self.frames, file_path, duration=self.delays, loop=gif_loop_count, disposal=disposal)
             elif ext == 'png':
                 # APNG supports looping directly
-                self.frames[0].save(
-                    file_path, save_all=True, append_images=self.frames[1:],
-                    duration=self.delays, loop=loop_count, format='PNG'
-                )
+                save_animation(self.frames, file_path, duration=self.delays, loop=loop_count, format='PNG')
             elif ext == 'webp':
                 # WebP supports looping directly
-                self.frames[0].save(
-                    file_path, save_all=True, append_images=self.frames[1:],
-                    duration=self.delays, loop=loop_count, format='WEBP'
-                )
+                save_animation(self.frames, file_path, duration=self.delays, loop=loop_count, format='WEBP')
             else:
                 messagebox.showerror("Error", f"Unsupported file format: {ext.upper()}")
                 return
@@ -491,6 +2300,31 @@ class GIFEditor:
         except Exception as e:
             messagebox.showerror("Error", f"Failed to save {ext.upper()}: {e}")
 
+    def toggle_disk_backed_storage(self):
+        """Switch between keeping frames in RAM and keeping them in memory-mapped scratch files."""
+        if self.disk_backed_storage.get():
+            self.offload_frames()
+            messagebox.showinfo("Disk-Backed Frame Storage", "Frames are now kept in memory-mapped scratch files.")
+        else:
+            messagebox.showinfo("Disk-Backed Frame Storage", "New and edited frames are kept in RAM again.")
+
+    def store_frame(self, frame):
+        """Return the entry to put into the frame list for a new frame, in the frame stores when disk-backed storage is on."""
+        if not self.disk_backed_storage.get() or isinstance(frame, FrameRef):
+            return frame
+        if frame.size not in self.frame_stores:
+            self.frame_stores[frame.size] = MappedFrameStore(frame.size)
+        return self.frame_stores[frame.size].store(frame)
+
+    def offload_frames(self):
+        """Move frames held in RAM into the memory-mapped frame stores when disk-backed storage is enabled."""
+        if not self.disk_backed_storage.get():
+            return
+        for i in range(len(self.frames)):
+            entry = self.frames.raw(i)
+            if not isinstance(entry, FrameRef):  # References are already backed by a file
+                self.frames[i] = self.store_frame(entry)
+
     def exit_closing(self):
         """Prompt the user to save changes before closing the window."""
         if self.frames:
@@ -501,15 +2335,17 @@ class GIFEditor:
                     return
             elif response is None:  # Cancel
                 return
+        for pool in (self.thread_pool, self.process_pool):
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
         self.master.destroy()
 
 # MENU EDIT
 
     def undo(self, event=None):
         """Undo the last action."""
-        if self.history:
-            self.redo_stack.append((self.frames.copy(), self.delays.copy(), [var.get() for var in self.checkbox_vars], self.frame_index, self.current_file))
-            self.frames, self.delays, checkbox_states, self.frame_index, self.current_file = self.history.pop()
+        if self.history.can_undo():
+            self.frames, self.delays, checkbox_states, self.frame_index, self.current_file = self.history.undo(self.capture_state())
             self.checkbox_vars = [IntVar(value=state) for state in checkbox_states]
             for i, var in enumerate(self.checkbox_vars):
                 var.trace_add('write', lambda *args, i=i: self.set_current_frame(i))
@@ -521,9 +2357,8 @@ class GIFEditor:
 
     def redo(self, event=None):
         """Redo the last undone action."""
-        if self.redo_stack:
-            self.history.append((self.frames.copy(), self.delays.copy(), [var.get() for var in self.checkbox_vars], self.frame_index, self.current_file))
-            self.frames, self.delays, checkbox_states, self.frame_index, self.current_file = self.redo_stack.pop()
+        if self.history.can_redo():
+            self.frames, self.delays, checkbox_states, self.frame_index, self.current_file = self.history.redo(self.capture_state())
             self.checkbox_vars = [IntVar(value=state) for state in checkbox_states]
             for i, var in enumerate(self.checkbox_vars):
                 var.trace_add('write', lambda *args, i=i: self.set_current_frame(i))
@@ -532,6 +2367,14 @@ class GIFEditor:
             self.update_title()
             self.check_all.set(False)  # Reset the check_all variable to ensure consistency
 
+    def set_undo_memory_budget(self):
+        """Prompt for the amount of RAM the undo history may use before it spills to disk."""
+        budget = simpledialog.askinteger("Undo Memory Budget", "Enter the undo memory budget in MB:",
+                                         initialvalue=self.history.budget_bytes >> 20, minvalue=16)
+        if budget is not None:
+            self.history.budget_bytes = budget << 20
+            self.history.enforce_budget(self.frames)
+
     def copy_frames(self, event=None):
         """Copy the selected frames to the clipboard."""
         self.copied_frames = [(self.frames[i].copy(), self.delays[i]) for i in range(len(self.checkbox_vars)) if self.checkbox_vars[i].get() == 1]
@@ -577,9 +2420,9 @@ class GIFEditor:
         self.save_state()
         if not self.check_any_frame_selected():
             return
-        for i, frame in enumerate(self.frames):
-            if self.checkbox_vars[i].get() == 1:
-                self.frames[i] = frame.rotate(180)
+        for i, var in enumerate(self.checkbox_vars):
+            if var.get() == 1:
+                self.frames[i] = self.frames[i].rotate(180)
         self.update_frame_list()
         self.show_frame()
 
@@ -588,9 +2431,9 @@ class GIFEditor:
         self.save_state()
         if not self.check_any_frame_selected():
             return
-        for i, frame in enumerate(self.frames):
-            if self.checkbox_vars[i].get() == 1:
-                self.frames[i] = frame.rotate(-90, expand=True)
+        for i, var in enumerate(self.checkbox_vars):
+            if var.get() == 1:
+                self.frames[i] = self.frames[i].rotate(-90, expand=True)
         self.update_frame_list()
         self.show_frame()
 
@@ -599,9 +2442,9 @@ class GIFEditor:
         self.save_state()
         if not self.check_any_frame_selected():
             return
-        for i, frame in enumerate(self.frames):
-            if self.checkbox_vars[i].get() == 1:
-                self.frames[i] = frame.rotate(90, expand=True)
+        for i, var in enumerate(self.checkbox_vars):
+            if var.get() == 1:
+                self.frames[i] = self.frames[i].rotate(90, expand=True)
         self.update_frame_list()
         self.show_frame()
 
@@ -617,9 +2460,9 @@ class GIFEditor:
 
             self.save_state()
 
-            for i, frame in enumerate(self.frames):
-                if self.checkbox_vars[i].get() == 1:
-                    self.frames[i] = frame.rotate(angle, expand=True)
+            for i, var in enumerate(self.checkbox_vars):
+                if var.get() == 1:
+                    self.frames[i] = self.frames[i].rotate(angle, expand=True)
 
             self.update_frame_list()
             self.show_frame()
@@ -632,9 +2475,9 @@ class GIFEditor:
         self.save_state()
         if not self.check_any_frame_selected():
             return
-        for i, frame in enumerate(self.frames):
-            if self.checkbox_vars[i].get() == 1:
-                self.frames[i] = frame.transpose(Image.FLIP_LEFT_RIGHT)
+        for i, var in enumerate(self.checkbox_vars):
+            if var.get() == 1:
+                self.frames[i] = self.frames[i].transpose(Image.FLIP_LEFT_RIGHT)
         self.update_frame_list()
         self.show_frame()
 
@@ -643,9 +2486,9 @@ class GIFEditor:
         self.save_state()
         if not self.check_any_frame_selected():
             return
-        for i, frame in enumerate(self.frames):
-            if self.checkbox_vars[i].get() == 1:
-                self.frames[i] = frame.transpose(Image.FLIP_TOP_BOTTOM)
+        for i, var in enumerate(self.checkbox_vars):
+            if var.get() == 1:
+                self.frames[i] = self.frames[i].transpose(Image.FLIP_TOP_BOTTOM)
         self.update_frame_list()
         self.show_frame()
 
@@ -1047,23 +2890,89 @@ class GIFEditor:
         if not file_paths:
             return
 
-        self.save_state()
+        self.import_files(file_paths, decode_first_frame, "Adding Images", "Failed to add images")
+
+    def import_files(self, file_paths, decode, title, error_text, on_complete=None):
+        """
+        Decode files on a thread pool and append the results to the frame list in selection order.
+
+        Parameters:
+        - file_paths (list): The files to import, in the order they were selected.
+        - decode (callable): Called on a worker thread with (file_path, base_size), returns (frames, delays).
+        - title (str): Title of the progress window.
+        - error_text (str): Message shown if a file fails to load.
+        - on_complete (callable): Optional callback run on the Tk thread once the import has finished.
+        """
         try:
-            for file_path in file_paths:
-                with Image.open(file_path) as image:
-                    if not self.frames:
-                        self.base_size = image.size
-                    image = self.resize_to_base_size(image.copy())
-                    self.frames.append(image)
-                self.delays.append(100)
-                var = IntVar()
-                var.trace_add('write', lambda *args, i=len(self.checkbox_vars): self.set_current_frame(i))
-                self.checkbox_vars.append(var)
+            if not self.frames:
+                with Image.open(file_paths[0]) as img:
+                    self.base_size = img.size  # Store the size of the first frame
+        except Exception as e:
+            messagebox.showerror("Error", f"{error_text}: {e}")
+            return
+        base_size = getattr(self, 'base_size', None)
+
+        self.save_state()  # Save the state before making changes
+
+        executor = self.get_thread_pool()
+        prefetch = (os.cpu_count() or 1) * 2  # Bound the number of decoded files waiting to be appended
+        pending = deque()
+        remaining = iter(file_paths)
+        imported = 0
+        cancel = False
 
+        def cancel_import():
+            nonlocal cancel
+            cancel = True
+
+        def submit_files():
+            for file_path in itertools.islice(remaining, prefetch - len(pending)):
+                pending.append(executor.submit(decode, file_path, base_size))
+
+        def finish(error=None):
+            for future in pending:
+                future.cancel()
+            progress_window.grab_release()
+            progress_window.destroy()
+            if on_complete:
+                on_complete()
             self.update_frame_list()
             self.show_frame()
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to add images: {e}")
+            if error is not None:
+                messagebox.showerror("Error", f"{error_text}: {error}")
+
+        def poll():
+            nonlocal imported
+            if cancel:
+                finish()
+                return
+
+            # Append finished files strictly in selection order
+            while pending and pending[0].done():
+                try:
+                    frames, delays = pending.popleft().result()
+                except Exception as e:
+                    finish(e)
+                    return
+                for frame, delay in zip(frames, delays):
+                    self.frames.append(self.store_frame(frame))
+                    self.delays.append(delay)
+                    var = IntVar()
+                    var.trace_add('write', lambda *args, i=len(self.checkbox_vars): self.set_current_frame(i))
+                    self.checkbox_vars.append(var)
+                imported += 1
+
+            submit_files()
+            progress_var.set((imported / len(file_paths)) * 100)
+            if not pending:
+                finish()
+                return
+            self.master.after(10, poll)
+
+        progress_window, progress_var = self.open_progress_window(title, cancel_import)
+
+        submit_files()
+        poll()
 
     def add_text_frame(self):
         """Create a frame with text using user inputs for font, size, color, outline, and position."""
@@ -1494,7 +3403,7 @@ class GIFEditor:
                 var.trace_remove('write', var.trace_info()[0][1])
 
         # Keep only the checked frames
-        self.frames = [self.frames[i] for i in indices_to_keep]
+        self.frames = FrameList(self.frames.raw(i) for i in indices_to_keep)
         self.delays = [self.delays[i] for i in indices_to_keep]
         self.checkbox_vars = [self.checkbox_vars[i] for i in indices_to_keep]
 
@@ -1668,8 +3577,9 @@ class GIFEditor:
         MAX_HEIGHT = 1600
 
         self.save_state()
-        for i, frame in enumerate(self.frames):
-            if self.checkbox_vars[i].get():
+        for i, var in enumerate(self.checkbox_vars):
+            if var.get():
+                frame = self.frames[i]
                 if maintain_aspect_ratio:
                     aspect_ratio = frame.width / frame.height
                     new_height = int(width / aspect_ratio)
@@ -1781,71 +3691,53 @@ class GIFEditor:
 
     def desaturate_frames(self):
         """Apply desaturation effect to the selected frames."""
-        self.save_state()  # Save the state before making changes
         if not self.check_any_frame_selected():
             return
-        for i, var in enumerate(self.checkbox_vars):
-            if var.get() == 1:
-                frame = self.frames[i]
-                self.frames[i] = frame.convert("L").convert("RGBA")  # Convert to grayscale and then back to RGBA
-        self.show_frame()
-        self.update_frame_list()
+        curve = ToneCurve().desaturate()  # Convert to grayscale and then back to RGBA
+        self.apply_frame_effect(PixelEffect(curve))
 
     def apply_sharpening_effect(self):
         """Apply a sharpening effect to the selected frames with user-defined intensity."""
         if not self.check_any_frame_selected():
             return
         # Prompt the user for the sharpening intensity
-        sharpening_intensity = simpledialog.askfloat(
-            "Sharpening Effect", 
-            "Enter sharpening intensity (e.g., 9.0 for 900%):", 
+        sharpening_intensity = self.ask(simpledialog.askfloat,
+            "Sharpening Effect",
+            "Enter sharpening intensity (e.g., 9.0 for 900%):",
             minvalue=1.0
         )
         
         if sharpening_intensity is None:
             return  # User canceled the dialog
 
-        self.save_state()  # Save the state before making changes
-
-        for i, var in enumerate(self.checkbox_vars):
-            if var.get() == 1:
-                frame = self.frames[i]
-                # Apply the sharpening filter with the user-defined intensity
-                enhancer = ImageEnhance.Sharpness(frame)
-                self.frames[i] = enhancer.enhance(sharpening_intensity)
-        
-        self.update_frame_list()
-        self.show_frame()
+        # Apply the sharpening filter with the user-defined intensity
+        self.apply_frame_effect(lambda frame, i: ImageEnhance.Sharpness(frame).enhance(sharpening_intensity))
 
     
     def apply_strange_sharpening_effect(self):
         """Apply a specialized sharpening effect to the selected frames for ghost and UFO photo studies."""
-        self.save_state()  # Save the state before making changes
         if not self.check_any_frame_selected():
             return
 
-        for i, var in enumerate(self.checkbox_vars):
-            if var.get() == 1:
-                frame = self.frames[i]
-                # Convert to grayscale to highlight edges more effectively
-                gray_frame = frame.convert("L")
-                
-                # Apply a strong edge enhancement filter
-                edge_enhanced = gray_frame.filter(ImageFilter.EDGE_ENHANCE_MORE)
-                
-                # Sharpen the image dramatically
-                sharpener = ImageEnhance.Sharpness(edge_enhanced)
-                sharpened_frame = sharpener.enhance(10.0)  # Increase sharpness significantly
-
-                # Optionally, enhance contrast to make features stand out more
-                contrast_enhancer = ImageEnhance.Contrast(sharpened_frame)
-                enhanced_frame = contrast_enhancer.enhance(2.0)  # Increase contrast
-
-                # Convert back to RGBA (if needed)
-                self.frames[i] = enhanced_frame.convert("RGBA")
-        
-        self.update_frame_list()
-        self.show_frame()
+        def strange_sharpen(frame, i):
+            # Convert to grayscale to highlight edges more effectively
+            gray_frame = frame.convert("L")
+            
+            # Apply a strong edge enhancement filter
+            edge_enhanced = gray_frame.filter(ImageFilter.EDGE_ENHANCE_MORE)
+            
+            # Sharpen the image dramatically
+            sharpener = ImageEnhance.Sharpness(edge_enhanced)
+            sharpened_frame = sharpener.enhance(10.0)  # Increase sharpness significantly
+
+            # Optionally, enhance contrast to make features stand out more
+            contrast_enhancer = ImageEnhance.Contrast(sharpened_frame)
+            enhanced_frame = contrast_enhancer.enhance(2.0)  # Increase contrast
+
+            # Convert back to RGBA (if needed)
+            return enhanced_frame.convert("RGBA")
+
+        self.apply_frame_effect(strange_sharpen)
 
     def apply_posterize_effect(self):
         """Apply a posterize effect to the selected frames with configurable intensity."""
@@ -1856,27 +3748,20 @@ class GIFEditor:
         default_levels = 4  # Default number of posterization levels
 
         # Prompt user for intensity value
-        levels = simpledialog.askinteger("Posterize Intensity", "Enter number of levels (2-20):", initialvalue=default_levels, minvalue=2, maxvalue=20)
+        levels = self.ask(
+            simpledialog.askinteger, "Posterize Intensity", "Enter number of levels (2-20):", initialvalue=default_levels, minvalue=2, maxvalue=20
+        )
         if levels is None:
             levels = default_levels
 
-        self.save_state()  # Save the state before making changes
-
-        def posterize(frame, levels):
+        def posterize(frame, i):
             """Posterize the frame to the specified number of levels."""
             # Convert to grayscale
             frame = frame.convert("RGB")
             quantized = frame.quantize(colors=levels, method=Image.FASTOCTREE)
             return quantized.convert("RGBA")
 
-        for i, var in enumerate(self.checkbox_vars):
-            if var.get() == 1:
-                frame = self.frames[i].convert("RGBA")
-                frame = posterize(frame, levels)
-                self.frames[i] = frame
-
-        self.update_frame_list()
-        self.show_frame()
+        self.apply_frame_effect(posterize)
 
     def apply_halftones_effect(self):
             """Apply a halftones effect to the selected frames."""
@@ -1887,7 +3772,7 @@ class GIFEditor:
             default_halftones_intensity = 10
 
             # Prompt user for intensity values
-            halftones_intensity = simpledialog.askinteger(
+            halftones_intensity = self.ask(simpledialog.askinteger,
                 "Halftones Intensity",
                 "Enter halftones intensity (1-100):",
                 initialvalue=default_halftones_intensity,
@@ -1898,7 +3783,7 @@ class GIFEditor:
                 halftones_intensity = default_halftones_intensity
 
             # Prompt user for shape
-            shape = simpledialog.askstring(
+            shape = self.ask(simpledialog.askstring,
                 "Halftones Shape",
                 "Enter halftones shape (dot/square):",
                 initialvalue="dot"
@@ -1906,48 +3791,8 @@ class GIFEditor:
             if shape is None or shape.lower() not in ["dot", "square"]:
                 shape = "dot"
 
-            self.save_state()  # Save the state before making changes
-
-            def halftones_effect(frame, intensity, shape):
-                """Convert the frame to a halftones style effect."""
-                frame = frame.convert("L")  # Convert to grayscale
-                width, height = frame.size
-                pixels = np.array(frame)
-
-                # Create a new image for the halftone effect
-                halftone_frame = Image.new("L", (width, height), "white")
-                draw = ImageDraw.Draw(halftone_frame)
-
-                dot_size = int(256 / intensity)
-                for y in range(0, height, dot_size):
-                    for x in range(0, width, dot_size):
-                        # Calculate the average brightness in the dot's area
-                        region = pixels[y:y + dot_size, x:x + dot_size]
-                        brightness = np.mean(region)
-
-                        # Map brightness to dot size
-                        size = dot_size * (1 - brightness / 255.0)
-                        if shape == "dot":
-                            draw.ellipse(
-                                (x, y, x + size, y + size),
-                                fill="black"
-                            )
-                        elif shape == "square":
-                            draw.rectangle(
-                                (x, y, x + size, y + size),
-                                fill="black"
-                            )
-
-                return halftone_frame.convert("RGBA")
-
-            for i, var in enumerate(self.checkbox_vars):
-                if var.get() == 1:
-                    frame = self.frames[i].convert("RGBA")
-                    frame = halftones_effect(frame, halftones_intensity, shape)
-                    self.frames[i] = frame
-
-            self.update_frame_list()
-            self.show_frame()
+            cell = int(256 / halftones_intensity)
+            self.apply_frame_effect(PixelEffect(lambda pixels, i: halftone_kernel(pixels, cell, shape.lower())))
 
     def apply_vignette_effect(self):
             """Apply a vignette effect to the selected frames."""
@@ -1960,7 +3805,7 @@ class GIFEditor:
             default_vignette_shape = "round"
 
             # Prompt user for intensity values
-            vignette_intensity = simpledialog.askinteger(
+            vignette_intensity = self.ask(simpledialog.askinteger,
                 "Vignette Intensity",
                 "Enter vignette intensity (1-100):",
                 initialvalue=default_vignette_intensity,
@@ -1971,7 +3816,7 @@ class GIFEditor:
                 vignette_intensity = default_vignette_intensity
 
             # Prompt user for color
-            vignette_color = colorchooser.askcolor(
+            vignette_color = self.ask(colorchooser.askcolor,
                 title="Choose Vignette Color",
                 initialcolor=default_vignette_color
             )[1]
@@ -1979,7 +3824,7 @@ class GIFEditor:
                 vignette_color = default_vignette_color
 
             # Prompt user for shape
-            vignette_shape = simpledialog.askstring(
+            vignette_shape = self.ask(simpledialog.askstring,
                 "Vignette Shape",
                 "Enter vignette shape (round/square):",
                 initialvalue=default_vignette_shape
@@ -1987,44 +3832,7 @@ class GIFEditor:
             if vignette_shape is None or vignette_shape.lower() not in ["round", "square"]:
                 vignette_shape = default_vignette_shape
 
-            self.save_state()  # Save the state before making changes
-
-            def vignette_effect(frame, intensity, color, shape):
-                """Apply a vignette effect to the frame."""
-                width, height = frame.size
-                vignette = Image.new("RGBA", (width, height), color + "00")
-                draw = ImageDraw.Draw(vignette)
-
-                if shape == "round":
-                    max_distance = np.sqrt((width / 2) ** 2 + (height / 2) ** 2)
-                    for y in range(height):
-                        for x in range(width):
-                            distance = np.sqrt((x - width / 2) ** 2 + (y - height / 2) ** 2)
-                            alpha = int(255 * (distance / max_distance) * (intensity / 100))
-                            alpha = min(255, alpha)
-                            r, g, b = ImageColor.getrgb(color)
-                            vignette.putpixel((x, y), (r, g, b, alpha))
-                elif shape == "square":
-                    for y in range(height):
-                        for x in range(width):
-                            distance_x = abs(x - width / 2)
-                            distance_y = abs(y - height / 2)
-                            max_distance = max(distance_x, distance_y)
-                            alpha = int(255 * (max_distance / (max(width, height) / 2)) * (intensity / 100))
-                            alpha = min(255, alpha)
-                            r, g, b = ImageColor.getrgb(color)
-                            vignette.putpixel((x, y), (r, g, b, alpha))
-
-                return Image.alpha_composite(frame, vignette)
-
-            for i, var in enumerate(self.checkbox_vars):
-                if var.get() == 1:
-                    frame = self.frames[i].convert("RGBA")
-                    frame = vignette_effect(frame, vignette_intensity, vignette_color, vignette_shape)
-                    self.frames[i] = frame
-
-            self.update_frame_list()
-            self.show_frame()
+            self.apply_frame_effect(vignette_effect(vignette_shape.lower(), vignette_intensity, vignette_color))
 
     def ghost_detection_effect(self):
         """Apply a ghost detection effect to the selected frames."""
@@ -2032,7 +3840,7 @@ class GIFEditor:
             return
 
         # Function to enhance and apply a ghostly effect
-        def apply_ghost_effect(frame):
+        def apply_ghost_effect(frame, i):
             # Convert to grayscale
             gray_frame = frame.convert("L")
 
@@ -2064,22 +3872,15 @@ class GIFEditor:
             return blended_frame
 
         # Apply the ghost effect to selected frames
-        self.save_state()  # Save the state before making changes
-        for i in range(len(self.frames)):
-            if self.checkbox_vars[i].get() == 1:
-                self.frames[i] = apply_ghost_effect(self.frames[i])
-
-            self.show_frame()
-            self.update_frame_list()
+        self.apply_frame_effect(apply_ghost_effect)
 
     def apply_anaglyph_effect(self):
         """Apply anaglyph (red-blue) effect to the selected frames with user-defined intensities for red and blue channels."""
-        self.save_state()  # Save the state before making changes
         if not self.check_any_frame_selected():
             return
 
         # Ask user for the intensity of the red channel offset
-        red_intensity = simpledialog.askinteger(
+        red_intensity = self.ask(simpledialog.askinteger,
             "Anaglyph Effect - Red Channel Intensity",
             "Enter the intensity for the red channel (default is 5, recommended range 3-10):",
             initialvalue=5,
@@ -2091,7 +3892,7 @@ class GIFEditor:
             return  # User cancelled the dialog
 
         # Ask user for the intensity of the blue channel offset
-        blue_intensity = simpledialog.askinteger(
+        blue_intensity = self.ask(simpledialog.askinteger,
             "Anaglyph Effect - Blue Channel Intensity",
             "Enter the intensity for the blue channel (default is 5, recommended range 3-10):",
             initialvalue=5,
@@ -2102,28 +3903,22 @@ class GIFEditor:
         if blue_intensity is None:
             return  # User cancelled the dialog
 
-        for i, var in enumerate(self.checkbox_vars):
-            if var.get() == 1:
-                frame = self.frames[i].convert("RGB")
-                r, g, b = frame.split()
+        def anaglyph(frame, i):
+            r, g, b = frame.convert("RGB").split()
 
-                # Offset the red and blue channels
-                r = r.transform(r.size, Image.AFFINE, (1, 0, -red_intensity, 0, 1, 0))  # Red channel shifted to the left
-                b = b.transform(b.size, Image.AFFINE, (1, 0, blue_intensity, 0, 1, 0))  # Blue channel shifted to the right
+            # Offset the red and blue channels
+            r = r.transform(r.size, Image.AFFINE, (1, 0, -red_intensity, 0, 1, 0))  # Red channel shifted to the left
+            b = b.transform(b.size, Image.AFFINE, (1, 0, blue_intensity, 0, 1, 0))  # Blue channel shifted to the right
 
-                anaglyph_frame = Image.merge("RGB", (r, g, b)).convert("RGBA")
-                self.frames[i] = anaglyph_frame
+            return Image.merge("RGB", (r, g, b)).convert("RGBA")
 
-        self.update_frame_list()
-        self.show_frame()
+        self.apply_frame_effect(anaglyph)
 
     def apply_kinetoscope_effect(self):
         """Apply an old Kinetoscope film effect to the selected frames with configurable intensity."""
         if not self.check_any_frame_selected():
             return
 
-        self.save_state()  # Save the state before making changes
-
         # Default intensity values
         default_noise_intensity = 30
         default_scratches_intensity = 10
@@ -2132,272 +3927,111 @@ class GIFEditor:
         default_vertical_lines_intensity = 5  # New intensity for vertical lines
 
         # Prompt user for intensity values
-        noise_intensity = simpledialog.askinteger(
+        noise_intensity = self.ask(simpledialog.askinteger,
             "Noise Intensity", "Enter noise intensity (0-100):", initialvalue=default_noise_intensity, minvalue=0, maxvalue=100)
         if noise_intensity is None:
             noise_intensity = default_noise_intensity
 
-        scratches_intensity = simpledialog.askinteger(
+        scratches_intensity = self.ask(simpledialog.askinteger,
             "Scratches Intensity", "Enter number of scratches (0-100):", initialvalue=default_scratches_intensity, minvalue=0, maxvalue=100)
         if scratches_intensity is None:
             scratches_intensity = default_scratches_intensity
 
-        sepia_intensity = simpledialog.askfloat(
+        sepia_intensity = self.ask(simpledialog.askfloat,
             "Sepia Intensity", "Enter sepia intensity (0.0-2.0):", initialvalue=default_sepia_intensity, minvalue=0.0, maxvalue=2.0)
         if sepia_intensity is None:
             sepia_intensity = default_sepia_intensity
 
-        jitter_intensity = simpledialog.askinteger(
+        jitter_intensity = self.ask(simpledialog.askinteger,
             "Jitter Intensity", "Enter jitter intensity (0-20):", initialvalue=default_jitter_intensity, minvalue=0, maxvalue=20)
         if jitter_intensity is None:
             jitter_intensity = default_jitter_intensity
 
-        vertical_lines_intensity = simpledialog.askinteger(
+        vertical_lines_intensity = self.ask(simpledialog.askinteger,
             "Vertical Lines Intensity", "Enter vertical lines intensity (0-100):", initialvalue=default_vertical_lines_intensity, minvalue=0, maxvalue=100)
         if vertical_lines_intensity is None:
             vertical_lines_intensity = default_vertical_lines_intensity
 
-        vertical_lines_color = simpledialog.askstring(
+        vertical_lines_color = self.ask(simpledialog.askstring,
             "Vertical Lines Color", "Enter vertical lines color in hexadecimal (e.g., #FFFFFF):", initialvalue="#FFFFFF")
         if vertical_lines_color is None:
             vertical_lines_color = "#FFFFFF"
 
-        scratches_color = simpledialog.askstring(
+        scratches_color = self.ask(simpledialog.askstring,
             "Scratches Color", "Enter scratches color in hexadecimal (e.g., #FFFFFF):", initialvalue="#FFFFFF")
         if scratches_color is None:
             scratches_color = "#FFFFFF"
 
-        def add_noise(frame, intensity):
-            """Add noise to the frame."""
-            width, height = frame.size
-            pixels = frame.load()
-            for _ in range(int(width * height * intensity / 100)):
-                x = random.randint(0, width - 1)
-                y = random.randint(0, height - 1)
-                noise = random.randint(-intensity, intensity)
-                r, g, b, a = pixels[x, y]
-                pixels[x, y] = (max(0, min(255, r + noise)), max(0, min(255, g + noise)), max(0, min(255, b + noise)), a)
-            return frame
-
-        def add_scratches(frame, num_scratches, color):
-            """Add realistic scratches to the frame."""
-            draw = ImageDraw.Draw(frame)
-            width, height = frame.size
-            for _ in range(num_scratches):
-                x_start = random.randint(0, width - 1)
-                y_start = random.randint(0, height - 1)
-                length = random.randint(20, 100)  # Length of the scratch
-                angle = random.uniform(-0.5, 0.5)  # Small angle to simulate vertical scratches
-                for i in range(length):
-                    x = int(x_start + i * angle)
-                    y = y_start + i
-                    if 0 <= x < width and 0 <= y < height:
-                        # Draw a small dot to make it look like a scratch
-                        draw.line([(x, y), (x, y)], fill=color, width=1)
-            return frame
-
-        def apply_sepia(frame, intensity):
-            """Apply a sepia tone to the frame."""
-            width, height = frame.size
-            pixels = frame.load()
-            for y in range(height):
-                for x in range(width):
-                    r, g, b, a = pixels[x, y]
-
-                    tr = int(0.393 * r + 0.769 * g + 0.189 * b)
-                    tg = int(0.349 * r + 0.686 * g + 0.168 * b)
-                    tb = int(0.272 * r + 0.534 * g + 0.131 * b)
-
-                    tr = min(255, int(tr * intensity))
-                    tg = min(255, int(tg * intensity))
-                    tb = min(255, int(tb * intensity))
+        scratches_color = ImageColor.getrgb(scratches_color)[:3]
+        vertical_lines_color = ImageColor.getrgb(vertical_lines_color)[:3]
+        seed = self.effect_seed()
 
-                    pixels[x, y] = (tr, tg, tb, a)
-            return frame
-
-        def jitter_frame(frame, max_jitter):
-            """Jitter the frame slightly to simulate film jitter."""
-            width, height = frame.size
-            jitter_x = random.randint(-max_jitter, max_jitter)
-            jitter_y = random.randint(-max_jitter, max_jitter)
-            new_frame = Image.new("RGBA", frame.size, (0, 0, 0, 0))
-            new_frame.paste(frame, (jitter_x, jitter_y))
-            return new_frame
-
-        def add_vertical_lines(frame, intensity, color):
-            """Add random vertical lines to the frame to simulate an old film effect."""
-            draw = ImageDraw.Draw(frame)
-            width, height = frame.size
-            num_lines = max(1, int(width * intensity / 100))  # Ensure at least one line
-            for _ in range(num_lines):
-                x = random.randint(0, width - 1)
-                line_thickness = 1  # Thin lines for a more authentic old film effect
-                draw.line([(x, 0), (x, height)], fill=color, width=line_thickness)
-            return frame
+        film_kernel = functools.partial(
+            seeded_kernel, kinetoscope_kernel, seed, noise_intensity=noise_intensity, scratches=scratches_intensity,
+            scratches_color=scratches_color, sepia_intensity=sepia_intensity, max_jitter=jitter_intensity,
+            lines_intensity=vertical_lines_intensity, lines_color=vertical_lines_color)
 
-        # Apply effects to each selected frame
-        for i, var in enumerate(self.checkbox_vars):
-            if var.get() == 1:
-                frame = self.frames[i].convert("RGBA")
-                frame = add_noise(frame, noise_intensity)
-                frame = add_scratches(frame, scratches_intensity, scratches_color)
-                frame = apply_sepia(frame, sepia_intensity)
-                frame = jitter_frame(frame, jitter_intensity)
-                frame = add_vertical_lines(frame, vertical_lines_intensity, vertical_lines_color)
-                self.frames[i] = frame
+        # Apply the whole chain to each selected frame, reading and writing every frame once
+        self.apply_frame_effect(PixelEffect(film_kernel), processes=True)
 
-        self.update_frame_list()
-        self.show_frame()
-        
     def invert_colors_of_selected_frames(self):
         """Invert colors of the selected frames."""
         if not any(var.get() for var in self.checkbox_vars):
             messagebox.showinfo("Info", "No frames selected for color inversion.")
             return
 
-        self.save_state()  # Save the state before making changes
-
-        for i, var in enumerate(self.checkbox_vars):
-            if var.get() == 1:
-                self.frames[i] = ImageOps.invert(self.frames[i].convert("RGB")).convert("RGBA")
-        
-        self.update_frame_list()
-        self.show_frame()
+        curve = ToneCurve().invert()
+        self.apply_frame_effect(PixelEffect(curve))
 
     def apply_tint(self):
             """Apply a tint effect to the selected frames."""
             if not self.check_any_frame_selected():
                 return
             # Prompt user for hex color code and intensity
-            color_code = simpledialog.askstring("Tint Effect", "Enter tint color (hex code, e.g., #FF0000 for red):")
+            color_code = self.ask(simpledialog.askstring, "Tint Effect", "Enter tint color (hex code, e.g., #FF0000 for red):")
             if not color_code or not (color_code.startswith('#') and len(color_code) == 7):
                 messagebox.showerror("Invalid Input", "Please enter a valid hex color code (e.g., #FF0000).")
                 return
             
-            intensity = simpledialog.askinteger("Tint Effect", "Enter intensity (0-100):", minvalue=0, maxvalue=100)
+            intensity = self.ask(simpledialog.askinteger, "Tint Effect", "Enter intensity (0-100):", minvalue=0, maxvalue=100)
             if intensity is None or not (0 <= intensity <= 100):
                 messagebox.showerror("Invalid Input", "Please enter an intensity value between 0 and 100.")
                 return
 
-            self.save_state()  # Save the state before making changes
-
-            # Apply the tint effect to the selected frames
-            for i, var in enumerate(self.checkbox_vars):
-                if var.get() == 1:
-                    self.frames[i] = self.tint_image(self.frames[i], color_code, intensity)
-            
-            self.show_frame()
-            self.update_frame_list()
-
-    def tint_image(self, image, color_code, intensity):
-        """Tint an image with the given color and intensity."""
-        if not self.check_any_frame_selected():
-            return
-        r, g, b = Image.new("RGB", (1, 1), color_code).getpixel((0, 0))
-        intensity /= 100.0
-
-        # Create a tinted image
-        tinted_image = Image.new("RGBA", image.size)
-        for x in range(image.width):
-            for y in range(image.height):
-                pixel = image.getpixel((x, y))
-                tr = int(pixel[0] + (r - pixel[0]) * intensity)
-                tg = int(pixel[1] + (g - pixel[1]) * intensity)
-                tb = int(pixel[2] + (b - pixel[2]) * intensity)
-                ta = pixel[3]
-                tinted_image.putpixel((x, y), (tr, tg, tb, ta))
-
-        return tinted_image
+            # Apply the tint effect to the selected frames, the lookup table is shared by all of them
+            curve = ToneCurve().tint(ImageColor.getrgb(color_code)[:3], intensity)
+            self.apply_frame_effect(PixelEffect(curve))
 
     def apply_random_glitch_effect(self):
         """Apply a random glitch effect to the selected frames."""
         if not self.check_any_frame_selected():
             return
-        def glitch_frame(frame):
-            """Apply glitch effect to a single frame."""
-            width, height = frame.size
-
-            # Convert frame to RGB
-            frame = frame.convert("RGB")
-            r, g, b = frame.split()
-
-            # Randomly offset each color channel (Chromatic Aberration)
-            r = r.transform(r.size, Image.AFFINE, (1, 0, random.uniform(-3, 3), 0, 1, random.uniform(-3, 3)))
-            g = g.transform(g.size, Image.AFFINE, (1, 0, random.uniform(-3, 3), 0, 1, random.uniform(-3, 3)))
-            b = b.transform(b.size, Image.AFFINE, (1, 0, random.uniform(-3, 3), 0, 1, random.uniform(-3, 3)))
-
-            # Merge channels back
-            frame = Image.merge("RGB", (r, g, b))
 
-            # Add displacement mapping
-            displacement = Image.effect_noise((width, height), 100)
-            displacement = displacement.filter(ImageFilter.GaussianBlur(1))
-            displacement = displacement.point(lambda p: p > 128 and 255)
-            frame = Image.composite(frame, frame.filter(ImageFilter.GaussianBlur(5)), displacement)
-
-            # Convert back to RGBA
-            frame = frame.convert("RGBA")
-
-            # Add random noise
-            pixels = frame.load()
-            for _ in range(random.randint(1000, 3000)):
-                x = random.randint(0, width - 1)
-                y = random.randint(0, height - 1)
-                noise = random.randint(50, 200)  # Gray noise
-                pixels[x, y] = (noise, noise, noise, pixels[x, y][3])
-
-            # Add horizontal gray lines with grain
-            for _ in range(random.randint(5, 20)):
-                y = random.randint(0, height - 1)
-                line_height = random.randint(1, 3)
-                gray_value = random.randint(50, 200)  # Gray line color
-                for line in range(line_height):
-                    if y + line < height:
-                        for x in range(width):
-                            grain = random.randint(-20, 20)  # Add grain effect
-                            alpha = pixels[x, y + line][3]
-                            gray_with_grain = min(max(gray_value + grain, 0), 255)
-                            pixels[x, y + line] = (gray_with_grain, gray_with_grain, gray_with_grain, alpha)
-
-            return frame
-
-        self.save_state()  # Save the state before making changes
-
-        for i, var in enumerate(self.checkbox_vars):
-            if var.get() == 1:
-                frame = self.frames[i]
-                glitched_frame = glitch_frame(frame.copy())
-                self.frames[i] = glitched_frame
-
-        self.update_frame_list()
-        self.show_frame()
+        seed = self.effect_seed()
+        self.apply_frame_effect(PixelEffect(functools.partial(seeded_kernel, glitch_kernel, seed)), processes=True)
 
     def apply_sketch_effect(self):
         """Apply a sketch effect to the selected frames."""
-        self.save_state()  # Save the state before making changes
         if not self.check_any_frame_selected():
             return
 
-        for i, var in enumerate(self.checkbox_vars):
-            if var.get() == 1:
-                frame = self.frames[i].convert("L")  # Convert to grayscale
-                inverted_frame = ImageOps.invert(frame)  # Invert colors
-                blurred_frame = inverted_frame.filter(ImageFilter.GaussianBlur(10))  # Apply Gaussian blur
-                sketch_frame = Image.blend(frame, blurred_frame, 0.5).convert("RGBA")  # Blend the original and blurred frames
-                
-                # Enhance edges
-                edge_enhanced_frame = sketch_frame.filter(ImageFilter.EDGE_ENHANCE_MORE)
-                self.frames[i] = edge_enhanced_frame
+        def sketch(frame, i):
+            frame = frame.convert("L")  # Convert to grayscale
+            inverted_frame = ImageOps.invert(frame)  # Invert colors
+            blurred_frame = inverted_frame.filter(ImageFilter.GaussianBlur(10))  # Apply Gaussian blur
+            sketch_frame = Image.blend(frame, blurred_frame, 0.5).convert("RGBA")  # Blend the original and blurred frames
+            
+            # Enhance edges
+            return sketch_frame.filter(ImageFilter.EDGE_ENHANCE_MORE)
 
-        self.update_frame_list()
-        self.show_frame()
+        self.apply_frame_effect(sketch)
 
     def prompt_and_apply_brightness_contrast(self):
         """Prompt the user for brightness and contrast levels, then apply the changes to selected frames."""
         if not self.check_any_frame_selected():
             return
-        brightness = simpledialog.askfloat("Brightness", "Enter brightness level (e.g., 1.0 for no change):", minvalue=0.0)
-        contrast = simpledialog.askfloat("Contrast", "Enter contrast level (e.g., 1.0 for no change):", minvalue=0.0)
+        brightness = self.ask(simpledialog.askfloat, "Brightness", "Enter brightness level (e.g., 1.0 for no change):", minvalue=0.0)
+        contrast = self.ask(simpledialog.askfloat, "Contrast", "Enter contrast level (e.g., 1.0 for no change):", minvalue=0.0)
         
         if brightness is not None and contrast is not None:
             self.apply_brightness_contrast(brightness, contrast)
@@ -2411,64 +4045,27 @@ class GIFEditor:
         - contrast (float): Contrast factor, where 1.0 means no change, less than 1.0 reduces contrast,
           and greater than 1.0 increases contrast.
         """
-        # Save the state before making changes
-        self.save_state()
 
-        for i, var in enumerate(self.checkbox_vars):
-            if var.get() == 1:
-                frame = self.frames[i]
-                # Apply brightness adjustment
-                enhancer = ImageEnhance.Brightness(frame)
-                frame = enhancer.enhance(brightness)
-                # Apply contrast adjustment
-                enhancer = ImageEnhance.Contrast(frame)
-                frame = enhancer.enhance(contrast)
-                self.frames[i] = frame
-
-        # Update the frame list and show the current frame
-        self.update_frame_list()
-        self.show_frame()
+        # Apply brightness and contrast adjustment as one lookup pass per frame
+        curve = ToneCurve().brightness(brightness).contrast(contrast)
+        self.apply_frame_effect(PixelEffect(curve))
 
     def adjust_hsl(self):
         """Prompt the user for Hue, Saturation, and Lightness adjustments and apply them to selected frames."""
         if not self.check_any_frame_selected():
             return
         # Get user input for HSL adjustments
-        hue_shift = simpledialog.askfloat("Adjust Hue", "Enter hue shift (-180 to 180):", minvalue=-180, maxvalue=180)
+        hue_shift = self.ask(simpledialog.askfloat, "Adjust Hue", "Enter hue shift (-180 to 180):", minvalue=-180, maxvalue=180)
         if hue_shift is None:
             return
-        saturation_factor = simpledialog.askfloat("Adjust Saturation", "Enter saturation factor (0.0 to 2.0):", minvalue=0.0, maxvalue=2.0)
+        saturation_factor = self.ask(simpledialog.askfloat, "Adjust Saturation", "Enter saturation factor (0.0 to 2.0):", minvalue=0.0, maxvalue=2.0)
         if saturation_factor is None:
             return
-        lightness_factor = simpledialog.askfloat("Adjust Lightness", "Enter lightness factor (0.0 to 2.0):", minvalue=0.0, maxvalue=2.0)
+        lightness_factor = self.ask(simpledialog.askfloat, "Adjust Lightness", "Enter lightness factor (0.0 to 2.0):", minvalue=0.0, maxvalue=2.0)
         if lightness_factor is None:
             return
 
-        self.save_state()  # Save the state before making changes
-
-        for i, var in enumerate(self.checkbox_vars):
-            if var.get() == 1:
-                frame = self.frames[i].convert("RGB")
-
-                # Adjust Hue
-                hsv_image = frame.convert("HSV")
-                hsv_data = list(hsv_image.getdata())
-                hsv_data = [(int((h + hue_shift) % 360), s, v) for h, s, v in hsv_data]
-                hsv_image.putdata(hsv_data)
-                frame = hsv_image.convert("RGB")
-
-                # Adjust Saturation
-                enhancer = ImageEnhance.Color(frame)
-                frame = enhancer.enhance(saturation_factor)
-
-                # Adjust Lightness
-                enhancer = ImageEnhance.Brightness(frame)
-                frame = enhancer.enhance(lightness_factor)
-
-                self.frames[i] = frame.convert("RGBA")
-
-        self.update_frame_list()
-        self.show_frame()
+        self.apply_frame_effect(hsl_effect(hue_shift, saturation_factor, lightness_factor))
 
     def apply_zoom_effect(self):
         """
@@ -2478,52 +4075,40 @@ class GIFEditor:
             return
         
         # Prompt the user for the zoom intensity
-        zoom_factor = simpledialog.askfloat("Zoom Effect", "Enter zoom intensity (e.g., 1.2 for 20% zoom in):", minvalue=0.1)
+        zoom_factor = self.ask(simpledialog.askfloat, "Zoom Effect", "Enter zoom intensity (e.g., 1.2 for 20% zoom in):", minvalue=0.1)
 
         # Exit the function if the user cancels the dialog or enters an invalid value
         if zoom_factor is None:
             return
 
-        # Save the state before making changes for undo functionality
-        self.save_state()
+        def zoom(frame, i):
+            width, height = frame.size
 
-        # Apply zoom effect to each selected frame
-        for i, var in enumerate(self.checkbox_vars):
-            if var.get() == 1:
-                frame = self.frames[i]
-                width, height = frame.size
-                try:
-                    # Calculate new dimensions
-                    new_width = int(width * zoom_factor)
-                    new_height = int(height * zoom_factor)
+            # Calculate new dimensions
+            new_width = int(width * zoom_factor)
+            new_height = int(height * zoom_factor)
 
-                    # Validate that new dimensions do not cause an overflow
-                    if new_width > 2**31-1 or new_height > 2**31-1:
-                        messagebox.showerror("Error", "Zoom factor results in dimensions too large to handle.")
-                        return
+            # Validate that new dimensions do not cause an overflow
+            if new_width > 2**31-1 or new_height > 2**31-1:
+                raise ValueError("Zoom factor results in dimensions too large to handle.")
 
-                    # Resize the frame with zoom
-                    zoomed_frame = frame.resize((new_width, new_height), Image.LANCZOS)
+            # Resize the frame with zoom
+            zoomed_frame = frame.resize((new_width, new_height), Image.LANCZOS)
 
-                    # Center crop the zoomed frame to the original size
-                    left = (new_width - width) // 2
-                    top = (new_height - height) // 2
-                    right = left + width
-                    bottom = top + height
+            # Center crop the zoomed frame to the original size
+            left = (new_width - width) // 2
+            top = (new_height - height) // 2
+            right = left + width
+            bottom = top + height
 
-                    # Ensure cropping coordinates are within bounds
-                    if right > new_width or bottom > new_height or left < 0 or top < 0:
-                        messagebox.showerror("Error", "Cropping coordinates out of bounds.")
-                        return
+            # Ensure cropping coordinates are within bounds
+            if right > new_width or bottom > new_height or left < 0 or top < 0:
+                raise ValueError("Cropping coordinates out of bounds.")
 
-                    self.frames[i] = zoomed_frame.crop((left, top, right, bottom))
-                except Exception as e:
-                    messagebox.showerror("Error", f"An error occurred while applying the zoom effect: {e}")
-                    return
+            return zoomed_frame.crop((left, top, right, bottom))
 
-        # Update the frame list and show the current frame
-        self.update_frame_list()
-        self.show_frame()
+        # Apply zoom effect to each selected frame, nothing changes if any frame fails
+        self.apply_frame_effect(zoom)
 
     def apply_zoom_effect_click(self):
         """Apply a zoom effect to the selected frames."""
@@ -2538,18 +4123,15 @@ class GIFEditor:
             messagebox.showinfo("Zoom Effect", "No frames selected for zooming.")
             return
 
-        self.save_state()  # Save the state before making changes
-
-        zoom_applied = False
-
         def on_click(event, preview_width, preview_height):
-            nonlocal zoom_applied
-            """Zoom into or out of the image at the clicked position."""
-            for frame_index in checked_indices:
-                frame = self.frames[frame_index]
+            """Zoom into or out of the selected frames at the clicked position."""
+            relative_x = event.x / preview_width
+            relative_y = event.y / preview_height
+
+            def zoom_at(frame, i):
                 width, height = frame.size
-                click_x = event.x * (width / preview_width)
-                click_y = event.y * (height / preview_height)
+                click_x = relative_x * width
+                click_y = relative_y * height
 
                 new_width = int(width * zoom_factor)
                 new_height = int(height * zoom_factor)
@@ -2560,22 +4142,18 @@ class GIFEditor:
                     top = max(0, min(int(click_y * zoom_factor - height // 2), new_height - height))
                     right = left + width
                     bottom = top + height
-                    self.frames[frame_index] = zoomed_frame.crop((left, top, right, bottom))
-                else:
-                    left = max(0, min(int(click_x - new_width // 2), width - new_width))
-                    top = max(0, min(int(click_y - new_height // 2), height - new_height))
-                    right = left + new_width
-                    bottom = top + new_height
+                    return zoomed_frame.crop((left, top, right, bottom))
 
-                    # Create a new image with the original size and paste the zoomed-out image onto it
-                    new_frame = Image.new("RGBA", (width, height))
-                    new_frame.paste(zoomed_frame, (left, top))
-                    self.frames[frame_index] = new_frame
+                left = max(0, min(int(click_x - new_width // 2), width - new_width))
+                top = max(0, min(int(click_y - new_height // 2), height - new_height))
+
+                # Create a new image with the original size and paste the zoomed-out image onto it
+                new_frame = Image.new("RGBA", (width, height))
+                new_frame.paste(zoomed_frame, (left, top))
+                return new_frame
 
-            zoom_applied = True
             zoom_window.destroy()
-            self.update_frame_list()
-            self.show_frame()
+            self.apply_frame_effect(zoom_at)
 
         # Create a new window to display the image
         zoom_window = tk.Toplevel(self.master)
@@ -2614,7 +4192,7 @@ class GIFEditor:
         MAX_BLUR_INTENSITY = 100
 
         # Prompt user for blur intensity
-        blur_intensity = simpledialog.askinteger("Blur Effect", "Enter blur intensity (0-100):", minvalue=0, maxvalue=MAX_BLUR_INTENSITY)
+        blur_intensity = self.ask(simpledialog.askinteger, "Blur Effect", "Enter blur intensity (0-100):", minvalue=0, maxvalue=MAX_BLUR_INTENSITY)
 
         # Exit the function if user cancels the dialog or enters invalid values
         if blur_intensity is None:
@@ -2624,15 +4202,8 @@ class GIFEditor:
             messagebox.showerror("Invalid Input", f"Please enter a valid blur intensity between 0 and {MAX_BLUR_INTENSITY}.")
             return
 
-        self.save_state()  # Save the state before making changes
-
         # Apply the blur effect to the selected frames
-        for i, var in enumerate(self.checkbox_vars):
-            if var.get() == 1:
-                self.frames[i] = self.frames[i].filter(ImageFilter.GaussianBlur(blur_intensity))
-
-        self.update_frame_list()
-        self.show_frame()
+        self.apply_frame_effect(lambda frame, i: frame.filter(ImageFilter.GaussianBlur(blur_intensity)))
 
     def apply_zoom_and_speed_blur_effect(self):
         """Prompt user to apply a zoom or speed blur effect to selected frames."""
@@ -2640,7 +4211,7 @@ class GIFEditor:
         if not self.check_any_frame_selected():
             return
         # Prompt user for effect type
-        effect_type = simpledialog.askstring("Choose Effect", "Enter effect type (zoom or speed):")
+        effect_type = self.ask(simpledialog.askstring, "Choose Effect", "Enter effect type (zoom or speed):")
         if effect_type is None:
             return  # User cancelled
         effect_type = effect_type.strip().lower()
@@ -2649,13 +4220,13 @@ class GIFEditor:
             return
 
         # Prompt user for intensity
-        intensity = simpledialog.askfloat("Effect Intensity", "Enter intensity (e.g., 1.2 for zoom, 5 for speed):", minvalue=0.1)
+        intensity = self.ask(simpledialog.askfloat, "Effect Intensity", "Enter intensity (e.g., 1.2 for zoom, 5 for speed):", minvalue=0.1)
         if intensity is None:
             return  # User cancelled
 
         # Handle speed blur specific input
         if effect_type == "speed":
-            direction = simpledialog.askstring("Speed Blur Direction", "Enter direction (right, left, top, bottom):")
+            direction = self.ask(simpledialog.askstring, "Speed Blur Direction", "Enter direction (right, left, top, bottom):")
             if direction is None:
                 return  # User cancelled
             direction = direction.strip().lower()
@@ -2663,61 +4234,12 @@ class GIFEditor:
                 messagebox.showerror("Invalid Input", "Please enter a valid direction: 'right', 'left', 'top', 'bottom'.")
                 return
 
-        self.save_state()  # Save the state before making changes
-
         # Apply the chosen effect to the selected frames
-        for i, var in enumerate(self.checkbox_vars):
-            if var.get() == 1:
-                if effect_type == "zoom":
-                    self.frames[i] = self.apply_zoom_blur(self.frames[i], intensity)
-                elif effect_type == "speed":
-                    self.frames[i] = self.apply_speed_blur(self.frames[i], intensity, direction)
-
-        self.update_frame_list()
-        self.show_frame()
-
-    def apply_zoom_blur(self, frame, intensity):
-        """Apply a zoom blur effect to a frame."""
-        width, height = frame.size
-
-        zoomed_frame = frame.copy()
-        for i in range(1, int(intensity * 10) + 1):
-            zoom_factor = 1 + i * 0.01
-            layer = frame.resize((int(width * zoom_factor), int(height * zoom_factor)), Image.LANCZOS)
-            layer = layer.crop((
-                (layer.width - width) // 2,
-                (layer.height - height) // 2,
-                (layer.width + width) // 2,
-                (layer.height + height) // 2
-            ))
-            zoomed_frame = Image.blend(zoomed_frame, layer, alpha=0.05)
-
-        return zoomed_frame
-
-    def apply_speed_blur(self, frame, intensity, direction):
-        """Apply a speed blur effect to a frame in the specified direction."""
-        width, height = frame.size
-
-        speed_blur_frame = frame.copy()
-        for i in range(1, int(intensity * 10) + 1):
-            offset = int(i * 2)
-            if direction == "right":
-                matrix = (1, 0, -offset, 0, 1, 0)
-            elif direction == "left":
-                matrix = (1, 0, offset, 0, 1, 0)
-            elif direction == "top":
-                matrix = (1, 0, 0, 0, 1, offset)
-            elif direction == "bottom":
-                matrix = (1, 0, 0, 0, 1, -offset)
-            layer = frame.transform(
-                frame.size,
-                Image.AFFINE,
-                matrix,
-                resample=Image.BICUBIC
-            )
-            speed_blur_frame = Image.blend(speed_blur_frame, layer, alpha=0.05)
-
-        return speed_blur_frame
+        count = int(intensity * 10)
+        if effect_type == "zoom":
+            self.apply_frame_effect(PixelEffect(lambda pixels, i: zoom_blur_kernel(pixels, count)))
+        elif effect_type == "speed":
+            self.apply_frame_effect(PixelEffect(lambda pixels, i: speed_blur_kernel(pixels, count, direction)))
 
     def apply_noise_effect(self):
         """
@@ -2727,9 +4249,9 @@ class GIFEditor:
             return
         
         # Prompt the user for the noise intensity
-        intensity = simpledialog.askinteger(
-            "Noise Effect", 
-            "Enter noise intensity (e.g., 10 for slight noise, 100 for heavy noise):", 
+        intensity = self.ask(simpledialog.askinteger,
+            "Noise Effect",
+            "Enter noise intensity (e.g., 10 for slight noise, 100 for heavy noise):",
             minvalue=1
         )
 
@@ -2742,39 +4264,13 @@ class GIFEditor:
             messagebox.showerror("Invalid Input", "Please enter a valid positive integer for noise intensity.")
             return
 
-        self.save_state()  # Save the state before making changes
-
-        def add_noise(image, intensity):
-            """Add noise to an image."""
-            width, height = image.size
-            pixels = image.load()
-
-            try:
-                for _ in range(width * height * intensity // 100):
-                    x = random.randint(0, width - 1)
-                    y = random.randint(0, height - 1)
-                    r, g, b, a = pixels[x, y]
-                    noise = random.randint(-intensity, intensity)
-                    pixels[x, y] = (
-                        max(0, min(255, r + noise)),
-                        max(0, min(255, g + noise)),
-                        max(0, min(255, b + noise)),
-                        a
-                    )
-            except Exception as e:
-                messagebox.showerror("Error", f"An error occurred while adding noise: {e}")
-                return image
-
-            return image
+        # The same seed reproduces the same noise, each frame draws from its own stream
+        seed = self.ask(simpledialog.askinteger, "Noise Effect", "Enter a seed to reproduce the noise:", initialvalue=random.randrange(2 ** 32), minvalue=0)
+        if seed is None:
+            return
 
         # Apply the noise effect to the selected frames
-        for i, var in enumerate(self.checkbox_vars):
-            if var.get() == 1:
-                frame = self.frames[i].convert("RGBA")
-                self.frames[i] = add_noise(frame, intensity)
-
-        self.update_frame_list()
-        self.show_frame()
+        self.apply_frame_effect(PixelEffect(functools.partial(seeded_kernel, noise_kernel, seed, intensity=intensity)), processes=True)
 
     def apply_pixelate_effect(self):
         """
@@ -2784,7 +4280,7 @@ class GIFEditor:
             return
 
         # Prompt user for pixelation intensity
-        pixel_size = simpledialog.askinteger("Pixelate Effect", "Enter pixel size (e.g., 10 for blocky effect):", minvalue=1)
+        pixel_size = self.ask(simpledialog.askinteger, "Pixelate Effect", "Enter pixel size (e.g., 10 for blocky effect):", minvalue=1)
         
         # Exit the function if user cancels the dialog or enters invalid values
         if pixel_size is None:
@@ -2794,55 +4290,22 @@ class GIFEditor:
             messagebox.showerror("Invalid Input", "Please enter a valid positive integer for pixel size.")
             return
 
-        self.save_state()  # Save the state before making changes
-
-        # Apply the pixelate effect to the selected frames
-        for i, var in enumerate(self.checkbox_vars):
-            if var.get() == 1:
-                frame = self.frames[i]
-                width, height = frame.size
-
-                # Validate that the pixel size is not too large for the image dimensions
-                if pixel_size > width or pixel_size > height:
-                    messagebox.showerror("Invalid Input", "Pixel size too large for the image dimensions.")
-                    return
-
-                try:
-                    # Resize down to pixel size and back up to original size
-                    small_frame = frame.resize((max(width // pixel_size, 1), max(height // pixel_size, 1)), Image.NEAREST)
-                    pixelated_frame = small_frame.resize(frame.size, Image.NEAREST)
-                    self.frames[i] = pixelated_frame
-                except Exception as e:
-                    messagebox.showerror("Error", f"An error occurred while applying the pixelate effect: {e}")
-                    return
-
-        self.update_frame_list()
-        self.show_frame()
+        # Apply the pixelate effect to the selected frames, nothing changes if any frame fails
+        self.apply_frame_effect(pixelate_effect(pixel_size))
 
     def reduce_transparency_of_checked_frames(self):
         """Reduce the transparency of the checked frames based on user-defined intensity."""
         if not self.check_any_frame_selected():
             return
         # Prompt the user for the transparency reduction intensity
-        intensity = simpledialog.askfloat("Transparency Reduction", "Enter intensity (0 to 1):", minvalue=0.0, maxvalue=1.0)
+        intensity = self.ask(simpledialog.askfloat, "Transparency Reduction", "Enter intensity (0 to 1):", minvalue=0.0, maxvalue=1.0)
         
         if intensity is None:
             return  # User canceled the dialog
 
-        self.save_state()  # Save the state before making changes
-
-        # Apply the transparency reduction to the checked frames
-        for i, var in enumerate(self.checkbox_vars):
-            if var.get() == 1:
-                frame = self.frames[i].convert("RGBA")
-                # Adjust the alpha channel based on the intensity
-                alpha = frame.split()[3]
-                alpha = ImageEnhance.Brightness(alpha).enhance(intensity)
-                frame.putalpha(alpha)
-                self.frames[i] = frame
-
-        self.update_frame_list()
-        self.show_frame()
+        # Apply the transparency reduction to the checked frames by scaling the alpha channel
+        curve = ToneCurve().scale_alpha(intensity)
+        self.apply_frame_effect(PixelEffect(curve))
 
     def slide_transition_effect(self):
         """Apply a slide transition effect to the selected frames based on user input for direction and speed."""
@@ -2951,12 +4414,23 @@ class GIFEditor:
         """Play the GIF animation."""
         self.is_playing = True
         self.play_button.config(text="Stop")
+        self.playback_deadline = time.monotonic()  # When the current frame is due on screen
+        self.playback_shown = deque()  # Display times within the last second, for the achieved FPS
+        self.playback_dropped = 0
+        self.playback_fps_updated = 0
         self.play_next_frame()
 
     def stop_animation(self):
         """Stop the GIF animation."""
         self.is_playing = False
         self.play_button.config(text="Play")
+        if self.playback_after_id is not None:
+            self.master.after_cancel(self.playback_after_id)
+            self.playback_after_id = None
+        if self.playback_buffer is not None:
+            self.playback_buffer.stop()
+            self.playback_buffer = None
+        self.playback_fps_label.config(text="")
 
     def change_preview_resolution(self):
         """Change the preview resolution based on user input."""
@@ -3069,12 +4543,63 @@ class GIFEditor:
             self.master.unbind_all("<Key>")
 
     def play_next_frame(self):
-        """Play the next frame in the animation."""
-        if self.is_playing and self.frames:
-            self.show_frame()
-            delay = self.delays[self.frame_index]
+        """Play the next frame in the animation, scheduled against a monotonic clock."""
+        self.playback_after_id = None
+        if not (self.is_playing and self.frames):
+            return
+        if self.frame_index >= len(self.frames):
+            self.frame_index = 0
+
+        # Drop frames whose display time already passed while we were rendering
+        now = time.monotonic()
+        if now - self.playback_deadline > sum(self.delays) / 1000:
+            self.playback_deadline = now  # More than a whole loop behind, resynchronize instead
+        for _ in range(len(self.frames) - 1):
+            frame_end = self.playback_deadline + self.delays[self.frame_index] / 1000
+            if now < frame_end:
+                break
+            self.playback_deadline = frame_end
             self.frame_index = (self.frame_index + 1) % len(self.frames)
-            self.master.after(delay, self.play_next_frame)
+            self.playback_dropped += 1
+
+        self.show_frame(self.take_prerendered_preview(self.frame_index))
+        self.update_playback_fps(now)
+        self.playback_deadline += self.delays[self.frame_index] / 1000
+        self.frame_index = (self.frame_index + 1) % len(self.frames)
+        wait = max(0, round((self.playback_deadline - time.monotonic()) * 1000))
+        self.playback_after_id = self.master.after(wait, self.play_next_frame)
+
+    def take_prerendered_preview(self, index):
+        """Return the preview of a frame from the playback buffer, or None if it is not ready or out of date."""
+        key = (len(self.frames), self.preview_width, self.preview_height)
+        if self.playback_buffer is None or self.playback_buffer.key != key:
+            if self.playback_buffer is not None:
+                self.playback_buffer.stop()
+            capacity = self.playback_buffer_budget // (self.preview_width * self.preview_height * 4)
+            self.playback_buffer = PlaybackBuffer(self.render_playback_preview, len(self.frames), max(2, capacity), key)
+        rendered = self.playback_buffer.take(index)
+        if rendered is None or rendered[0] is not self.frames.raw(index):
+            return None  # Not rendered yet, or the frame was edited since
+        return rendered[1]
+
+    def render_playback_preview(self, index):
+        """Render a preview for the playback buffer, on its producer thread."""
+        entry = self.frames.raw(index)
+        return entry, self.preview_frame(index)
+
+    def update_playback_fps(self, now):
+        """Show the achieved frame rate of the last second next to the rate the delays ask for."""
+        self.playback_shown.append(now)
+        while now - self.playback_shown[0] > 1:
+            self.playback_shown.popleft()
+        if now - self.playback_fps_updated < 0.5:
+            return
+        self.playback_fps_updated = now
+        span = self.playback_shown[-1] - self.playback_shown[0]
+        achieved_fps = (len(self.playback_shown) - 1) / span if span > 0 else 0
+        total_duration = sum(self.delays)
+        target_fps = len(self.delays) * 1000 / total_duration if total_duration else 0
+        self.playback_fps_label.config(text=f"Playback: {achieved_fps:.1f} / {target_fps:.1f} fps ({self.playback_dropped} dropped)")
 
 
     def toggle_draw_mode(self, event=None):
@@ -3355,30 +4880,72 @@ class GIFEditor:
 
     def focus_current_frame(self):
         """Ensure the current frame is visible in the frame list."""
-        if self.frame_list.winfo_children():
-            frame_widgets = self.frame_list.winfo_children()
-            current_frame_widget = frame_widgets[self.frame_index]
-            self.canvas.yview_moveto(current_frame_widget.winfo_y() / self.canvas.bbox("all")[3])
+        if self.frames:
+            self.frame_list_top = self.frame_index
+            self.update_frame_list()
 
     def setup_frame_list(self):
-        """Set up the frame list with scrollbar."""
+        """Set up the virtualized frame list with scrollbar."""
         self.frame_list_frame = Frame(self.master)
         self.frame_list_frame.pack(side=tk.LEFT, fill=tk.Y)
 
-        self.scrollbar = Scrollbar(self.frame_list_frame, orient="vertical")
+        self.scrollbar = Scrollbar(self.frame_list_frame, orient="vertical", command=self.scroll_frame_list)
         self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
 
-        self.canvas = Canvas(self.frame_list_frame, yscrollcommand=self.scrollbar.set)
+        self.canvas = Canvas(self.frame_list_frame)
         self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        self.scrollbar.config(command=self.canvas.yview)
 
+        # Only the visible rows exist as widgets, they are recycled as the list scrolls
         self.frame_list = Frame(self.canvas)
-        self.canvas.create_window((0, 0), window=self.frame_list, anchor='nw')
+        self.frame_list.place(x=0, y=0, relwidth=1, relheight=1)
+        self.empty_list_label = tk.Label(self.frame_list, text="No frames available")
+        self.frame_rows = []
+        self.frame_list_top = 0
+        self.frame_row_height = None
+        self.blank_thumbnail = tk.PhotoImage(width=self.thumbnail_size[0], height=self.thumbnail_size[1])
 
-        self.frame_list.bind("<Configure>", lambda e: self.canvas.configure(scrollregion=self.canvas.bbox("all")))
+        self.canvas.bind("<Configure>", lambda e: self.update_frame_list())
+        self.bind_frame_list_wheel(self.frame_list)
 
         self.update_frame_list()
 
+    def bind_frame_list_wheel(self, widget):
+        """Scroll the frame list with the mouse wheel while the pointer is over widget."""
+        widget.bind("<MouseWheel>", lambda e: self.scroll_frame_list('scroll', -1 if e.delta > 0 else 1, 'units'))
+        widget.bind("<Button-4>", lambda e: self.scroll_frame_list('scroll', -1, 'units'))
+        widget.bind("<Button-5>", lambda e: self.scroll_frame_list('scroll', 1, 'units'))
+
+    def scroll_frame_list(self, *args):
+        """Scroll the frame list in response to the scrollbar or the mouse wheel."""
+        if args[0] == 'moveto':
+            self.frame_list_top = int(float(args[1]) * len(self.delays))
+        elif args[0] == 'scroll':
+            step = self.visible_frame_rows() - 1 if args[2] == 'pages' else 3
+            self.frame_list_top += int(args[1]) * max(1, step)
+        self.update_frame_list()
+
+    def create_frame_row(self):
+        """Create one recyclable row of the frame list."""
+        frame_container = Frame(self.frame_list)
+        checkbox = Checkbutton(frame_container)
+        checkbox.pack(side=tk.LEFT)
+        thumbnail = tk.Label(frame_container, image=self.blank_thumbnail)
+        thumbnail.pack(side=tk.LEFT)
+        label = tk.Label(frame_container, anchor='w')
+        label.pack(side=tk.LEFT, fill=tk.X)
+        for widget in (frame_container, checkbox, thumbnail, label):
+            self.bind_frame_list_wheel(widget)
+        return {'container': frame_container, 'checkbox': checkbox, 'thumbnail': thumbnail, 'label': label, 'state': None}
+
+    def visible_frame_rows(self):
+        """Return how many rows fit into the frame list, including a partially visible last row."""
+        if self.frame_row_height is None:
+            row = self.create_frame_row()
+            self.frame_rows.append(row)
+            row['container'].update_idletasks()
+            self.frame_row_height = max(1, row['container'].winfo_reqheight())
+        return max(1, self.canvas.winfo_height() // self.frame_row_height + 1)
+
     def setup_control_frame(self):
         """Set up the control frame with image display."""
         self.control_frame_canvas = tk.Canvas(self.master)
@@ -3405,6 +4972,9 @@ class GIFEditor:
         self.total_duration_label = tk.Label(self.image_display_frame, text="", font=("Arial", 8), fg="grey")
         self.total_duration_label.pack(pady=5)
 
+        self.playback_fps_label = tk.Label(self.image_display_frame, text="", font=("Arial", 8), fg="grey")
+        self.playback_fps_label.pack(pady=5)
+
         self.control_inputs_frame = tk.Frame(self.control_frame)
         self.control_inputs_frame.grid(row=1, column=0, padx=20, pady=10, sticky='n')
 
@@ -3483,58 +5053,94 @@ class GIFEditor:
     def resize_to_base_size(self, image):
         """Resize the image to the base size of the first frame and center it."""
         if hasattr(self, 'base_size'):
-            base_width, base_height = self.base_size
-            new_image = Image.new("RGBA", self.base_size, (0, 0, 0, 0))
-            image = image.resize(self.base_size, Image.Resampling.LANCZOS)
-            new_image.paste(image, ((base_width - image.width) // 2, (base_height - image.height) // 2))
-            return new_image
+            return fit_to_size(image, self.base_size)
         return image
 
     def update_frame_list(self):
-        """Update the frame list with the current frames and their delays."""
-        for widget in self.frame_list.winfo_children():
-            widget.destroy()
-
-        if not self.frames:
-            tk.Label(self.frame_list, text="No frames available").pack()
-            self.canvas.config(scrollregion=self.canvas.bbox("all"))
+        """Update the visible rows of the frame list with the current frames and their delays."""
+        self.history.enforce_budget(self.frames)  # The frames replaced by the last action now count against the budget
+        count = min(len(self.delays), len(self.checkbox_vars))
+        if not self.frames or not count:
+            for row in self.frame_rows:
+                row['container'].place_forget()
+                row['state'] = None
+            self.empty_list_label.pack()
+            self.scrollbar.set(0, 1)
+            self.thumbnail_worker.request([])
             return
+        self.empty_list_label.pack_forget()
+
+        visible_rows = self.visible_frame_rows()
+        while len(self.frame_rows) < visible_rows:
+            self.frame_rows.append(self.create_frame_row())
+
+        # Keep the last page full instead of scrolling past the end of the list
+        self.frame_list_top = max(0, min(self.frame_list_top, count - visible_rows + 1))
+
+        missing_thumbnails = []
+        for r, row in enumerate(self.frame_rows):
+            i = self.frame_list_top + r
+            if r >= visible_rows or i >= count:
+                if row['state'] is not None:
+                    row['container'].place_forget()
+                    row['state'] = None
+                continue
 
-        for i, (frame, delay, var) in enumerate(zip(self.frames, self.delays, self.checkbox_vars)):
-            frame_container = Frame(self.frame_list, bg='gray' if i == self.frame_index else self.frame_list.cget('bg'))
-            frame_container.pack(fill=tk.X)
+            entry = self.frames.raw(i)
+            photo = self.thumbnail_cache.get(entry)
+            if photo is None:
+                missing_thumbnails.append(entry)
+                photo = self.blank_thumbnail
 
-            checkbox = Checkbutton(frame_container, variable=var, bg=frame_container.cget('bg'))
-            checkbox.pack(side=tk.LEFT)
+            state = (i, self.delays[i], i == self.frame_index, self.checkbox_vars[i], photo)
+            if row['state'] == state:
+                continue  # Rows whose frame, delay and highlight did not change are left alone
+            if row['state'] is None:
+                row['container'].place(x=0, y=r * self.frame_row_height, relwidth=1, height=self.frame_row_height)
 
-            frame_label_text = f"Frame {i + 1}: {delay} ms"
+            bg = 'gray' if i == self.frame_index else self.frame_list.cget('bg')
+            frame_label_text = f"Frame {i + 1}: {self.delays[i]} ms"
             if i == self.frame_index:
                 frame_label_text = f"→ {frame_label_text}"
 
-            label = tk.Label(frame_container, text=frame_label_text, bg=frame_container.cget('bg'))
-            label.pack(side=tk.LEFT, fill=tk.X)
-
-        self.canvas.config(scrollregion=self.canvas.bbox("all"))
+            row['container'].config(bg=bg)
+            row['checkbox'].config(variable=self.checkbox_vars[i], bg=bg)
+            row['thumbnail'].config(image=photo, bg=bg)
+            row['label'].config(text=frame_label_text, bg=bg)
+            row['state'] = state
+
+        self.scrollbar.set(self.frame_list_top / count, min(1.0, (self.frame_list_top + visible_rows - 1) / count))
+        self.thumbnail_worker.request(missing_thumbnails)
+        if missing_thumbnails and self.thumbnail_poll_id is None:
+            self.thumbnail_poll_id = self.master.after(30, self.poll_thumbnails)
+
+    def poll_thumbnails(self):
+        """Turn finished thumbnails into PhotoImages on the Tk thread and show them."""
+        self.thumbnail_poll_id = None
+        finished = self.thumbnail_worker.results()
+        for entry, thumbnail in finished:
+            self.thumbnail_cache.put(entry, ImageTk.PhotoImage(thumbnail), image_nbytes(thumbnail))
+        if finished:
+            self.update_frame_list()
+        if self.thumbnail_worker.busy() and self.thumbnail_poll_id is None:
+            self.thumbnail_poll_id = self.master.after(30, self.poll_thumbnails)
 
     def set_current_frame(self, index):
         """Set the current frame to the one corresponding to the clicked checkbox."""
         self.frame_index = index
         self.show_frame()
 
-    def show_frame(self):
-        """Display the current frame."""
+    def show_frame(self, rendered=None):
+        """Display the current frame, using the already rendered preview and frame size if given."""
         if self.frames:
             if self.frame_index >= len(self.frames):
                 self.frame_index = len(self.frames) - 1
-            frame = self.frames[self.frame_index]
-            preview = self.resize_image(frame, max_width=self.preview_width, max_height=self.preview_height)
-            photo = ImageTk.PhotoImage(preview)
-            self.image_label.config(image=photo, bd=2, relief="solid")
-            self.image_label.image = photo
+            preview, (width, height) = rendered or self.preview_frame(self.frame_index)
+            self.display_preview(preview)
             self.image_label.config(text='')
             self.delay_entry.delete(0, tk.END)
             self.delay_entry.insert(0, str(self.delays[self.frame_index]))
-            self.dimension_label.config(text=f"Size: {frame.width}x{frame.height}")
+            self.dimension_label.config(text=f"Size: {width}x{height}")
             total_duration = sum(self.delays)
             self.total_duration_label.config(text=f"Total Duration: {total_duration} ms")
         else:
@@ -3545,10 +5151,34 @@ class GIFEditor:
             self.total_duration_label.config(text="")
         self.update_frame_list()
 
+    def display_preview(self, preview):
+        """Show a preview in the image label, pasting into the same PhotoImage while its size fits."""
+        photo = getattr(self, 'preview_photo', None)
+        if photo is None or getattr(self.image_label, "image", None) is not photo or (photo.width(), photo.height()) != preview.size:
+            photo = self.preview_photo = ImageTk.PhotoImage("RGBA", preview.size)
+            self.image_label.config(image=photo, bd=2, relief="solid")
+            self.image_label.image = photo
+        photo.paste(preview)
+
+    def preview_frame(self, index):
+        """Return the resized preview of a frame and the frame's size, resampling only on a cache miss."""
+        entry = self.frames.raw(index)
+        cached = self.preview_cache.get(entry, self.preview_width, self.preview_height)
+        if cached is None:
+            frame = self.frames[index]
+            preview = self.resize_image(frame, max_width=self.preview_width, max_height=self.preview_height).convert("RGBA")
+            cached = (preview, frame.size)
+            self.preview_cache.put(entry, cached, image_nbytes(preview), self.preview_width, self.preview_height)
+        return cached
+
     def save_state(self):
         """Save the current state for undo functionality."""
-        self.history.append((self.frames.copy(), self.delays.copy(), [var.get() for var in self.checkbox_vars], self.frame_index, self.current_file))
-        self.redo_stack.clear()
+        self.offload_frames()  # Frames produced by the previous action are spilled before they are shared with the history
+        self.history.push(self.capture_state())
+
+    def capture_state(self):
+        """Return a snapshot of the frames, delays, checkboxes, frame index and file name."""
+        return (self.frames.copy(), self.delays.copy(), [var.get() for var in self.checkbox_vars], self.frame_index, self.current_file)
 
     def resize_image(self, image, max_width, max_height):
         """Resize image while maintaining aspect ratio."""
@@ -0,0 +1,52 @@
+import os
+
+import numpy as np
+from PIL import Image
+
+from GIFCraft import FrameList, LazyFrameSource, save_animation
+
+
+def write_gif(path, count=40):
+    rng = np.random.default_rng(0)
+    frames = [Image.fromarray(rng.integers(0, 255, (24, 32, 3), np.uint8)) for _ in range(count)]
+    frames[0].save(path, save_all=True, append_images=frames[1:], duration=50, loop=0)
+
+
+def test_save_over_source_file(tmp_path):
+    path = str(tmp_path / "animation.gif")
+    write_gif(path)
+    source = LazyFrameSource(path, cache_size=4)
+    frames = FrameList(source.frames())
+    expected = [np.asarray(frame.convert("RGB")) for frame in frames]
+
+    save_animation(frames, path, duration=source.delays, loop=0)
+
+    assert source not in LazyFrameSource.open_sources
+    with Image.open(path) as saved:
+        assert saved.n_frames == len(expected)
+    for frame, pixels in zip(frames, expected):
+        assert np.array_equal(np.asarray(frame.convert("RGB")), pixels)
+
+
+def test_closed_source_releases_file(tmp_path):
+    path = str(tmp_path / "animation.gif")
+    write_gif(path)
+    source = LazyFrameSource(path, cache_size=2)
+    frames = FrameList(source.frames())
+    expected = [np.asarray(frame) for frame in FrameList(LazyFrameSource(path).frames())]
+
+    source.close()
+    os.remove(path)
+
+    for frame, pixels in zip(frames, expected):
+        assert np.array_equal(np.asarray(frame), pixels)
+
+
+def test_frames_read_backwards_match_forward(tmp_path):
+    path = str(tmp_path / "animation.gif")
+    write_gif(path)
+    forward = [np.asarray(frame) for frame in FrameList(LazyFrameSource(path).frames())]
+
+    frames = FrameList(LazyFrameSource(path, cache_size=2).frames())
+    for index in reversed(range(len(forward))):
+        assert np.array_equal(np.asarray(frames[index]), forward[index])
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+from PIL import Image, ImageEnhance, ImageOps
+
+from GIFCraft import ToneCurve
+
+
+def random_image(seed=0, size=(48, 40)):
+    rng = np.random.default_rng(seed)
+    return Image.fromarray(rng.integers(0, 256, (size[1], size[0], 4), np.uint8), "RGBA")
+
+
+@pytest.mark.parametrize("factor", [0.0, 0.3, 0.77, 1.0, 1.3, 2.9])
+def test_brightness_matches_image_enhance(factor):
+    image = random_image()
+    expected = ImageEnhance.Brightness(image).enhance(factor)
+    assert np.array_equal(np.asarray(ToneCurve().brightness(factor).apply_image(image)), np.asarray(expected))
+
+
+@pytest.mark.parametrize("factor", [0.0, 0.3, 0.77, 1.0, 1.3, 2.9])
+def test_contrast_matches_image_enhance(factor):
+    image = random_image(1)
+    expected = ImageEnhance.Contrast(image).enhance(factor)
+    assert np.array_equal(np.asarray(ToneCurve().contrast(factor).apply_image(image)), np.asarray(expected))
+
+
+def test_chained_adjustments_match_image_enhance():
+    image = random_image(2)
+    expected = ImageEnhance.Contrast(ImageEnhance.Brightness(image).enhance(1.4)).enhance(0.6)
+    expected = ImageEnhance.Brightness(expected).enhance(0.9)
+    curve = ToneCurve().brightness(1.4).contrast(0.6).brightness(0.9)
+    assert np.array_equal(np.asarray(curve.apply_image(image)), np.asarray(expected))
+
+
+def test_batch_matches_single_frames():
+    images = [random_image(seed) for seed in range(3)]
+    curve = ToneCurve().brightness(1.2).contrast(1.5)
+    batch = np.stack([np.array(image) for image in images])
+    curve.apply(batch)
+    for pixels, image in zip(batch, images):
+        assert np.array_equal(pixels, np.asarray(curve.apply_image(image)))
+
+
+def test_invert_matches_image_ops():
+    image = random_image(3)
+    expected = ImageOps.invert(image.convert("RGB")).convert("RGBA")
+    assert np.array_equal(np.asarray(ToneCurve().invert().apply_image(image)), np.asarray(expected))
+
+
+@pytest.mark.parametrize("factor", [0.0, 0.25, 0.6, 1.0])
+def test_scale_alpha_matches_brightness_on_alpha(factor):
+    image = random_image(4)
+    expected = image.copy()
+    expected.putalpha(ImageEnhance.Brightness(image.getchannel("A")).enhance(factor))
+    assert np.array_equal(np.asarray(ToneCurve().scale_alpha(factor).apply_image(image)), np.asarray(expected))
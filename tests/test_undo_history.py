@@ -0,0 +1,106 @@
+import numpy as np
+from PIL import Image
+
+from GIFCraft import EffectLayer, FrameImageCache, FrameList, PixelEffect, StackedFrame, ToneCurve, UndoHistory
+
+
+def random_frames(count, size=(256, 256), seed=0):
+    rng = np.random.default_rng(seed)
+    return FrameList(Image.fromarray(rng.integers(0, 255, size + (4,), np.uint8), "RGBA") for _ in range(count))
+
+
+def state(frames):
+    return (frames.copy(), [100] * len(frames), [1] * len(frames), 0, None)
+
+
+def pixels(frames):
+    return [np.asarray(frame) for frame in frames]
+
+
+def test_frames_replaced_by_an_effect_stay_within_budget():
+    frames = random_frames(10)
+    expected = pixels(frames)
+    history = UndoHistory(budget_bytes=1 << 20)
+
+    history.push(state(frames))
+    invert = PixelEffect(ToneCurve().invert())
+    live = FrameList(invert(frame, i) for i, frame in enumerate(frames))
+    del frames
+    history.enforce_budget(live)
+
+    assert history.memory_usage(live) <= history.budget_bytes
+    restored = history.undo(state(live))[0]
+    assert all(np.array_equal(a, b) for a, b in zip(pixels(restored), expected))
+
+
+def apply_effects(history, frames, effects):
+    """Apply effects like the editor does, pushing the state first, and return the frames and the pixels after each step."""
+    steps = [pixels(frames)]
+    for effect in effects:
+        history.push(state(frames))
+        frames = FrameList(effect(frame, i) for i, frame in enumerate(frames))
+        history.enforce_budget(frames)
+        steps.append(pixels(frames))
+    return frames, steps
+
+
+def paste_square(frame, i):
+    frame = frame.copy()
+    frame.paste((255, 0, 0, 255), (10, 10, 40, 40))
+    return frame
+
+
+def check_round_trip(history, frames, steps):
+    for expected in reversed(steps[:-1]):
+        frames = history.undo(state(frames))[0]
+        assert all(np.array_equal(a, b) for a, b in zip(pixels(frames), expected))
+    assert not history.can_undo()
+    for expected in steps[1:]:
+        frames = history.redo(state(frames))[0]
+        assert all(np.array_equal(a, b) for a, b in zip(pixels(frames), expected))
+    assert not history.can_redo()
+
+
+def test_undo_redo_round_trip():
+    history = UndoHistory()
+    effects = [PixelEffect(ToneCurve().invert()), paste_square, PixelEffect(ToneCurve().brightness(0.5))]
+    frames, steps = apply_effects(history, random_frames(5, (64, 64)), effects)
+    check_round_trip(history, frames, steps)
+
+
+def test_undo_redo_round_trip_with_spilled_snapshots():
+    history = UndoHistory(budget_bytes=0)
+    effects = [PixelEffect(ToneCurve().invert()), paste_square, PixelEffect(ToneCurve().brightness(0.5))]
+    frames, steps = apply_effects(history, random_frames(5, (64, 64)), effects)
+    assert history.memory_usage(frames) == 0  # Everything the history holds is on disk
+    check_round_trip(history, frames, steps)
+
+
+def test_undo_restores_palette_frames():
+    history = UndoHistory(budget_bytes=0)
+    frames = FrameList(frame.convert("RGB").quantize(16) for frame in random_frames(3, (32, 32)))
+    frames, steps = apply_effects(history, frames, [PixelEffect(ToneCurve().invert())])
+    restored = history.undo(state(frames))[0]
+    assert all(frame.mode == "P" for frame in restored)
+    assert all(np.array_equal(a, b) for a, b in zip(pixels(restored), steps[0]))
+
+
+def test_saving_state_does_not_render_stacked_frames():
+    rendered = []
+
+    def invert(frame, i):
+        rendered.append(i)
+        return PixelEffect(ToneCurve().invert())(frame, i)
+
+    history = UndoHistory(budget_bytes=0)
+    frames = random_frames(3, (32, 32))
+    expected = pixels(frames)
+    history.push(state(frames))
+    layer = EffectLayer("Invert", invert, None, None)
+    cache = FrameImageCache(1 << 20)
+    stacked = FrameList(StackedFrame(frames.raw(i), [layer], i, cache) for i in range(len(frames)))
+    history.enforce_budget(stacked)  # Encodes the pushed frames against the stacked frames
+
+    assert not rendered
+    restored = history.undo(state(stacked))[0]
+    assert all(np.array_equal(a, b) for a, b in zip(pixels(restored), expected))